@@ -0,0 +1,152 @@
+"""
+Фильтр Блума - вероятностная структура для проверки "есть ли элемент в множестве".
+
+Фильтр хранит массив из m ячеек и для каждого элемента отмечает k ячеек (k хэш-функций).
+- Если хотя бы одна из k ячеек элемента не отмечена - элемента точно нет (ложноотрицательных
+  ответов не бывает).
+- Если все k отмечены - элемент, вероятно, есть (возможен ложноположительный ответ).
+
+Для n элементов и желаемой вероятности ложноположительного ответа p:
+    m = -n * ln(p) / (ln 2)^2,    k = m / n * ln 2
+
+Варианты:
+- `BloomFilter` - битовый массив (1 бит на ячейку), удаление невозможно;
+- `CountingBloomFilter` - счетчик (1 байт) на ячейку, поддерживает `remove`. Счетчик, дошедший
+  до 255, больше не уменьшается - так фильтр никогда не дает ложноотрицательного ответа.
+
+k индексов получаются двойным хэшированием из одного `hash(key)`: index_i = h1 + i * h2 (mod m).
+"""
+
+import math
+
+# Константа Кнута для перемешивания битов хэша (2^64 / золотое сечение).
+_GOLDEN = 0x9E3779B97F4A7C15
+_MASK64 = (1 << 64) - 1
+
+
+class BloomFilter:
+    # конструктор: capacity - ожидаемое количество элементов, fp_rate - желаемая доля ложных срабатываний
+    def __init__(self, capacity, fp_rate=0.01):
+        if not 0 < fp_rate < 1:
+            raise ValueError('fp_rate must be in range (0, 1)')
+        capacity = max(capacity, 1)
+        self.fp_rate = fp_rate
+        self._m = max(8, math.ceil(-capacity * math.log(fp_rate) / math.log(2) ** 2))
+        self._k = max(1, round(self._m / capacity * math.log(2)))
+        self._init_storage()
+
+    def _init_storage(self):
+        self._bits = bytearray((self._m + 7) // 8)
+
+    # k индексов ячеек для ключа (двойное хэширование)
+    def _indexes(self, key):
+        x = (hash(key) * _GOLDEN) & _MASK64
+        h1 = x >> 32
+        h2 = (x & 0xFFFFFFFF) | 1
+        m = self._m
+        return [(h1 + i * h2) % m for i in range(self._k)]
+
+    # отмечает ключ в фильтре
+    def add(self, key):
+        bits = self._bits
+        for index in self._indexes(key):
+            bits[index >> 3] |= 1 << (index & 7)
+
+    # False - ключа точно нет; True - ключ, вероятно, есть
+    def might_contain(self, key):
+        # индексы считаются по одному: для отсутствующего ключа обычно хватает 1-2 проверок
+        x = (hash(key) * _GOLDEN) & _MASK64
+        index = x >> 32
+        step = (x & 0xFFFFFFFF) | 1
+        m = self._m
+        bits = self._bits
+        for _ in range(self._k):
+            index %= m
+            if not bits[index >> 3] & (1 << (index & 7)):
+                return False
+            index += step
+        return True
+
+    __contains__ = might_contain
+
+    # размер фильтра в байтах
+    def nbytes(self):
+        return len(self._bits)
+
+
+class CountingBloomFilter(BloomFilter):
+    def _init_storage(self):
+        self._counts = bytearray(self._m)
+
+    def add(self, key):
+        counts = self._counts
+        for index in self._indexes(key):
+            if counts[index] < 255:
+                counts[index] += 1
+
+    # убирает ключ из фильтра; вызывать только для ключей, которые были добавлены
+    def remove(self, key):
+        counts = self._counts
+        for index in self._indexes(key):
+            # насыщенный счетчик не уменьшаем - иначе возможен ложноотрицательный ответ
+            if 0 < counts[index] < 255:
+                counts[index] -= 1
+
+    def might_contain(self, key):
+        x = (hash(key) * _GOLDEN) & _MASK64
+        index = x >> 32
+        step = (x & 0xFFFFFFFF) | 1
+        m = self._m
+        counts = self._counts
+        for _ in range(self._k):
+            index %= m
+            if not counts[index]:
+                return False
+            index += step
+        return True
+
+    __contains__ = might_contain
+
+    def nbytes(self):
+        return len(self._counts)
+
+
+# Тесты
+import unittest
+
+
+class TestBloomFilter(unittest.TestCase):
+    def test_no_false_negatives(self):
+        for cls in (BloomFilter, CountingBloomFilter):
+            bloom = cls(1000)
+            for i in range(1000):
+                bloom.add(f"key{i}")
+            for i in range(1000):
+                self.assertIn(f"key{i}", bloom)
+
+    def test_false_positive_rate(self):
+        for cls in (BloomFilter, CountingBloomFilter):
+            bloom = cls(10000, fp_rate=0.01)
+            for i in range(10000):
+                bloom.add(i)
+            false_positives = sum(bloom.might_contain(i) for i in range(10000, 30000))
+            self.assertLess(false_positives / 20000, 0.03)
+
+    def test_counting_remove(self):
+        bloom = CountingBloomFilter(100)
+        bloom.add("apple")
+        bloom.add("banana")
+        bloom.remove("apple")
+        self.assertNotIn("apple", bloom)
+        self.assertIn("banana", bloom)
+
+    def test_bit_filter_is_smaller(self):
+        self.assertLess(BloomFilter(1000).nbytes() * 4, CountingBloomFilter(1000).nbytes())
+
+    def test_bad_fp_rate(self):
+        with self.assertRaises(ValueError):
+            BloomFilter(10, fp_rate=1.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,154 @@
+"""
+Потокобезопасная хэш-таблица с разделением блокировок (lock striping).
+
+Вместо одной общей блокировки на всю таблицу пространство ключей делится на N независимых
+сегментов (shards). Каждый сегмент - это обычная `HashTableOnLists` со своей блокировкой
+и своим `_resize`:
+- операции с ключами из разных сегментов не конкурируют за блокировку;
+- рехэширование одного сегмента останавливает только этот сегмент, а не всю таблицу.
+
+Номер сегмента берется из старших битов мультипликативного хэша (hash(key) * A, метод Кнута).
+Если брать просто `hash(key) % N`, то все ключи сегмента имели бы одинаковый остаток по модулю N,
+и внутри сегмента (где индекс корзины тоже `hash(key) % capacity`) часть корзин пустовала бы.
+
+API совпадает с `HashTableOnLists`: `find`, `push`, `pop`, а также пакетные `push_many`,
+`find_many`, `pop_many`, которые берут блокировку каждого сегмента один раз на пакет.
+"""
+
+import threading
+
+from HashTableOnLists import HashTableOnLists
+
+# Константа Кнута для мультипликативного хэширования (2^64 / золотое сечение).
+_GOLDEN = 0x9E3779B97F4A7C15
+_MASK64 = (1 << 64) - 1
+
+
+class ConcurrentHashTable:
+    # конструктор класса
+    def __init__(self, shards=16, capacity=10, **table_options):
+        if shards < 1:
+            raise ValueError('shards must be positive')
+        self._shards = [HashTableOnLists(capacity, **table_options) for _ in range(shards)]
+        self._locks = [threading.Lock() for _ in range(shards)]
+
+    # номер сегмента для хэша ключа
+    def _shard_index(self, h):
+        return (((h * _GOLDEN) & _MASK64) >> 32) % len(self._shards)
+
+    # находит и возвращает элемент по ключу
+    def find(self, key):
+        i = self._shard_index(hash(key))
+        with self._locks[i]:
+            return self._shards[i].find(key)
+
+    # вставляет элемент
+    def push(self, key):
+        i = self._shard_index(hash(key))
+        with self._locks[i]:
+            self._shards[i].push(key)
+
+    # удаляет и возвращает элемент
+    def pop(self, key):
+        i = self._shard_index(hash(key))
+        with self._locks[i]:
+            return self._shards[i].pop(key)
+
+    # раскладывает ключи пакета по сегментам, запоминая их позиции в пакете
+    def _group(self, keys):
+        groups = [([], []) for _ in self._shards]
+        for position, key in enumerate(keys):
+            shard_keys, positions = groups[self._shard_index(hash(key))]
+            shard_keys.append(key)
+            positions.append(position)
+        return groups
+
+    # пакетная вставка: блокировка каждого сегмента берется один раз
+    def push_many(self, keys):
+        added = 0
+        for i, (shard_keys, _) in enumerate(self._group(keys)):
+            if shard_keys:
+                with self._locks[i]:
+                    added += self._shards[i].push_many(shard_keys)
+        return added
+
+    # пакетный поиск/удаление: результаты возвращаются в порядке исходного пакета
+    def _per_key(self, keys, method):
+        keys = list(keys)
+        result = [False] * len(keys)
+        for i, (shard_keys, positions) in enumerate(self._group(keys)):
+            if shard_keys:
+                with self._locks[i]:
+                    flags = getattr(self._shards[i], method)(shard_keys)
+                for position, flag in zip(positions, flags):
+                    result[position] = flag
+        return result
+
+    def find_many(self, keys):
+        return self._per_key(keys, 'find_many')
+
+    def pop_many(self, keys):
+        return self._per_key(keys, 'pop_many')
+
+    # общее количество элементов (моментальный снимок, сегменты опрашиваются по очереди)
+    def __len__(self):
+        total = 0
+        for lock, shard in zip(self._locks, self._shards):
+            with lock:
+                total += shard._size
+        return total
+
+    # Строковое представление (по сегментам)
+    def __str__(self):
+        return str([str(shard) for shard in self._shards])
+
+
+# Тесты
+import unittest
+
+
+class TestConcurrentHashTable(unittest.TestCase):
+    def setUp(self):
+        self.table = ConcurrentHashTable(shards=4)
+
+    def test_push_find_pop(self):
+        self.table.push("apple")
+        self.table.push("banana")
+        self.assertEqual(self.table.find("apple"), "apple")
+        self.assertIsNone(self.table.find("orange"))
+        self.assertEqual(self.table.pop("apple"), "apple")
+        self.assertIsNone(self.table.find("apple"))
+        self.assertEqual(len(self.table), 1)
+
+    def test_keys_spread_over_shards(self):
+        for i in range(1000):
+            self.table.push(i)
+        sizes = [shard._size for shard in self.table._shards]
+        self.assertEqual(sum(sizes), 1000)
+        self.assertTrue(all(size > 150 for size in sizes))
+
+    def test_batch_results_keep_order(self):
+        self.assertEqual(self.table.push_many(range(100)), 100)
+        self.assertEqual(self.table.find_many([5, 500, 99]), [True, False, True])
+        self.assertEqual(self.table.pop_many([500, 5, 5]), [False, True, False])
+        self.assertEqual(len(self.table), 99)
+
+    def test_concurrent_writers(self):
+        def worker(start):
+            for i in range(start, start + 2000):
+                self.table.push(i)
+            for i in range(start, start + 2000, 2):
+                self.table.pop(i)
+
+        threads = [threading.Thread(target=worker, args=(n * 2000,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(len(self.table), 8000)
+        self.assertEqual(self.table.find_many(range(1, 16000, 2)), [True] * 8000)
+        self.assertEqual(self.table.find_many(range(0, 16000, 2)), [False] * 8000)
+
+
+if __name__ == "__main__":
+    unittest.main()
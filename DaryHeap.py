@@ -0,0 +1,128 @@
+"""
+d-арная минимальная куча (d-ary heap).
+
+Обобщение `MinHeap`: у каждого узла не 2, а d детей. Для узла с индексом i:
+- дети - индексы d * i + 1 ... d * i + d;
+- родитель - (i - 1) // d.
+
+Высота дерева - log_d(n) вместо log_2(n): при d = 4 она вдвое меньше, при d = 8 - втрое.
+- push (sift_up) - O(log_d n) сравнений: становится быстрее с ростом d;
+- pop_min (sift_down) - O(d * log_d n) сравнений, но дети узла лежат в памяти подряд,
+  поэтому на больших кучах такой проход дружелюбнее к кэшу.
+
+Отличия от `MinHeap` в реализации:
+- арифметика индексов вписана прямо в циклы (без вызовов `left_child`/`right_child`);
+- просеивание "дыркой" (hole): перемещаемый элемент запоминается, а на пути вниз или вверх
+  элементы просто сдвигаются на место дырки, и только в конце он записывается один раз.
+  Это одно присваивание на уровень вместо обмена кортежами.
+"""
+
+from Heap import MinHeap
+
+
+class DaryHeap(MinHeap):
+    # Инициализатор класса. d - арность кучи (количество детей у узла).
+    def __init__(self, d=4):
+        super().__init__()
+        if d < 2:
+            raise ValueError('Арность кучи должна быть не меньше 2')
+        self.d = d
+
+    # Индекс родителя.
+    def parent(self, index):
+        return (index - 1) // self.d
+
+    # Индекс первого (левого) ребенка.
+    def left_child(self, index):
+        return index * self.d + 1
+
+    # Индекс последнего (правого) ребенка.
+    def right_child(self, index):
+        return index * self.d + self.d
+
+    # "Всплытие" дыркой: родители, которые больше элемента, сдвигаются вниз.
+    def sift_up(self, index):
+        heap = self.heap
+        d = self.d
+        item = heap[index]
+        while index > 0:
+            parent_idx = (index - 1) // d
+            parent_item = heap[parent_idx]
+            if not item < parent_item:
+                break
+            heap[index] = parent_item
+            index = parent_idx
+        heap[index] = item
+
+    # "Просеивание" дыркой: наименьший из d детей поднимается на место дырки.
+    def sift_down(self, index):
+        heap = self.heap
+        N = len(heap)
+        d = self.d
+        item = heap[index]
+        while True:
+            first = index * d + 1
+            if first >= N:
+                break
+            last = first + d
+            if last > N:
+                last = N
+            # ищем наименьшего ребенка среди d подряд лежащих элементов
+            best = first
+            best_item = heap[first]
+            for child in range(first + 1, last):
+                child_item = heap[child]
+                if child_item < best_item:
+                    best = child
+                    best_item = child_item
+            if not best_item < item:
+                break
+            heap[index] = best_item
+            index = best
+        heap[index] = item
+
+    # Построение кучи за O(n): начинаем с последнего узла, у которого есть дети.
+    def _build(self):
+        for i in range((len(self.heap) - 2) // self.d, -1, -1):
+            self.sift_down(i)
+
+
+import random
+import unittest
+
+
+class TestDaryHeap(unittest.TestCase):
+    def test_push_and_pop_min(self):
+        for d in (2, 3, 4, 8):
+            heap = DaryHeap(d)
+            values = [random.Random(d).randrange(1000) for _ in range(500)]
+            for value in values:
+                heap.push(value)
+            self.assertEqual(heap.get_min(), min(values))
+            self.assertEqual([heap.pop_min() for _ in range(500)], sorted(values))
+            self.assertIsNone(heap.pop_min())
+
+    def test_heapify(self):
+        for d in (2, 4, 8):
+            heap = DaryHeap(d)
+            arr = list(range(300))
+            random.Random(0).shuffle(arr)
+            heap.heapify(arr)
+            for i in range(1, len(heap.heap)):
+                self.assertLessEqual(heap.heap[heap.parent(i)], heap.heap[i])
+            self.assertEqual([heap.pop_min() for _ in range(300)], list(range(300)))
+
+    def test_index_arithmetic(self):
+        heap = DaryHeap(4)
+        self.assertEqual(heap.left_child(0), 1)
+        self.assertEqual(heap.right_child(0), 4)
+        self.assertEqual(heap.parent(4), 0)
+        self.assertEqual(heap.parent(5), 1)
+
+    def test_bad_arity(self):
+        with self.assertRaises(ValueError):
+            DaryHeap(1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -6,13 +6,81 @@
 - capacity() - Возвращает число элементов, которое массив может содержать без выделения дополнительного пространства.
 
 Также должен быть реализован метод взятия и изменения элемента по индексу - по [] - как у стандартного массива.
+
+Типизированный режим: `MyDynamicArray(typecode='q')` (а также 'd', 'B' и другие коды модуля `array`)
+хранит числа не списком указателей на объекты Python (8 байт на указатель + 28 и больше байт на int),
+а подряд в машинном представлении (`array.array`), например 8 байт на int64.
+Такой массив отдает свою память через протокол буфера: `arr.memoryview()` (и `memoryview(arr)`
+начиная с Python 3.12) без копирования, поэтому его можно передать в NumPy (`np.frombuffer`),
+`struct.unpack_from` или `file.write`.
+
+Политика роста (`growth`) определяет новую емкость, когда место закончилось:
+- 'double' (по умолчанию) - удвоение;
+- '1.5x' - рост в полтора раза: меньше неиспользуемой памяти, но больше перевыделений;
+- 'cpython' - как у list в CPython: size + size/8 + 6;
+- 'chunk' - фиксированными блоками по 4096 элементов (память почти без запаса,
+  но перевыделений O(n / chunk) и вставка уже не амортизированная O(1)).
+Можно передать и свою функцию `growth(capacity, required) -> new_capacity`.
+
+Срезы и векторные операции:
+- `arr[a:b:c]` в типизированном режиме возвращает memoryview без копирования
+  (в обычном режиме - list с копией элементов);
+- `map(func)`, `add(other)`, `scale(factor)` возвращают новый массив того же типа,
+  `sum()`, `min()`, `max()` - число, `argsort()` - массив индексов ('q').
+Если установлен NumPy, числовые операции выполняются им поверх того же буфера (без копирования
+входа); иначе - встроенными функциями (`sum`, `min`, `map`, `sorted`) по memoryview.
+
+Обработка команд: `process_commands` читает каждую команду через `input()` и печатает каждый
+ответ через `print`. `python DynamicArray.py --fast` делает то же самое потоково: читает
+`sys.stdin.buffer` большими блоками, режет на токены `split()`, выбирает обработчик по словарю
+и выводит все ответы одной записью. `python DynamicArray.py --bench-commands [n]` сравнивает
+оба режима на синтетическом потоке из n команд.
+`python DynamicArray.py --bench-growth [n] [typecode]` сравнивает политики по числу
+перевыделений и пиковой памяти процесса.
 """
 
+import operator
+from array import array
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+# Политики роста: функция (текущая емкость, требуемый размер) -> новая емкость (не меньше требуемого).
+def growth_factor(factor):
+    def growth(capacity, required):
+        return max(required, capacity + 1, int(capacity * factor))
+    return growth
+
+
+def growth_chunk(chunk):
+    def growth(capacity, required):
+        return max(required, capacity + chunk)
+    return growth
+
+
+# Переаллокация list в CPython (Objects/listobject.c): запас в 1/8 размера плюс константа.
+def growth_cpython(capacity, required):
+    return max(required, (required + (required >> 3) + 6) & ~3)
+
+
+GROWTH_POLICIES = {
+    'double': growth_factor(2),
+    '1.5x': growth_factor(1.5),
+    'cpython': growth_cpython,
+    'chunk': growth_chunk(4096),
+}
+
 
 # Класс, реализующий динамический массив (аналог list в Python, но с ручным управлением памятью).
 class MyDynamicArray:
     # Инициализатор класса.
-    def __init__(self):
+    # typecode - код типа модуля array ('q', 'd', 'B', ...) для типизированного режима,
+    # None - обычный режим (любые объекты Python).
+    # growth - имя политики роста из GROWTH_POLICIES или функция (capacity, required) -> capacity.
+    def __init__(self, typecode=None, growth='double'):
         # _size: Хранит текущее количество элементов, фактически находящихся в массиве.
         # Начинается с 0, так как массив изначально пуст.
         self._size = 0
@@ -20,9 +88,23 @@ class MyDynamicArray:
         # Это максимальное количество элементов, которое может вместить массив БЕЗ перераспределения памяти.
         # Начинается с 1.
         self._capacity = 1
+        # Емкость, ниже которой массив не сжимается (поднимается через reserve).
+        self._min_capacity = 1
+        self.typecode = typecode
+        self._growth = GROWTH_POLICIES[growth] if isinstance(growth, str) else growth
+        # Количество перевыделений внутреннего массива.
+        self._resize_count = 0
         # array: Внутренний список Python фиксированного размера, используемый для хранения элементов.
         # Инициализируется списком из одного элемента None.
-        self.array = [None] * self._capacity
+        # В типизированном режиме - array.array той же длины, заполненный нулями.
+        self.array = self._allocate(self._capacity)
+
+    # Выделяет внутреннее хранилище на capacity элементов.
+    def _allocate(self, capacity):
+        if self.typecode is None:
+            return [None] * capacity
+        # Умножение массива из одного нуля выполняется в C и сразу дает непрерывный буфер.
+        return array(self.typecode, [0]) * capacity
 
     # Возвращает текущее количество элементов в массиве.
     def size(self):
@@ -38,14 +120,39 @@ class MyDynamicArray:
         # значит, во внутреннем массиве нет свободного места.
         if self._size == self._capacity:
             # Необходимо увеличить размер внутреннего массива.
-            # Вызываем приватный метод _resize, удваивая текущую емкость.
-            self._resize(2 * self._capacity)
+            # Новую емкость выбирает политика роста (по умолчанию - удвоение).
+            self._resize(self._growth(self._capacity, self._size + 1))
         # Теперь место гарантированно есть. Добавляем элемент на позицию _size.
         # (Так как индексы начинаются с 0, _size указывает на первый свободный слот).
         self.array[self._size] = item
         # Увеличиваем счетчик фактического количества элементов.
         self._size += 1
 
+    # Добавляет в конец все элементы iterable.
+    # Емкость увеличивается не больше одного раза (сразу до нужного размера), а элементы
+    # копируются одним присваиванием срезу.
+    def extend(self, iterable):
+        if self.typecode is None:
+            items = iterable if isinstance(iterable, (list, tuple)) else list(iterable)
+        elif isinstance(iterable, array) and iterable.typecode == self.typecode:
+            items = iterable
+        else:
+            items = array(self.typecode, iterable)
+        new_size = self._size + len(items)
+        if new_size > self._capacity:
+            # Политика роста, а не ровно new_size, чтобы серия мелких extend
+            # оставалась амортизированной O(1).
+            self._resize(self._growth(self._capacity, new_size))
+        self.array[self._size:new_size] = items
+        self._size = new_size
+
+    # Создает массив из элементов iterable.
+    @classmethod
+    def from_iterable(cls, iterable, typecode=None):
+        arr = cls(typecode)
+        arr.extend(iterable)
+        return arr
+
     # Удаляет и возвращает последний элемент из динамического массива.
     def pop_back(self):
         # Проверка: если массив пуст (_size == 0), удалять нечего.
@@ -56,29 +163,53 @@ class MyDynamicArray:
         item = self.array[self._size - 1]
         # Опционально: очищаем ячейку, где был элемент (заменяем на None).
         # Это может помочь сборщику мусора, если на элемент нет других ссылок.
-        self.array[self._size - 1] = None
+        # В типизированном режиме хранить None нельзя, а ссылок на объекты там нет.
+        if self.typecode is None:
+            self.array[self._size - 1] = None
         # Уменьшаем счетчик фактического количества элементов.
         self._size -= 1
+        self._shrink()
         # Возвращаем удаленный элемент.
-        # Примечание: Текущая реализация не уменьшает емкость (_capacity) при удалении.
-        # В некоторых реализациях добавляют логику сжатия массива при _size << _capacity.
         return item
 
+    # Сжимает массив вдвое, когда он заполнен меньше чем на четверть.
+    # Порог 1/4, а не 1/2: иначе чередование push_back/pop_back на границе
+    # вызывало бы перевыделение на каждой операции.
+    def _shrink(self):
+        if self._capacity > self._min_capacity and self._size < self._capacity // 4:
+            self._resize(max(self._capacity // 2, self._min_capacity))
+
+    # Заранее выделяет место под n элементов; до shrink_to_fit массив не сжимается ниже n.
+    def reserve(self, n):
+        self._min_capacity = max(self._min_capacity, n)
+        if n > self._capacity:
+            self._resize(n)
+
+    # Уменьшает емкость до текущего размера и сбрасывает reserve.
+    def shrink_to_fit(self):
+        self._min_capacity = 1
+        if self._capacity > max(self._size, 1):
+            self._resize(max(self._size, 1))
+
     # Приватный вспомогательный метод для изменения размера внутреннего массива.
     def _resize(self, new_capacity):
         # Создаем новый список Python (_new_array) с заданной новой емкостью.
-        new_array = [None] * new_capacity
+        new_array = self._allocate(new_capacity)
         # Копируем элементы из старого массива (self.array) в новый (_new_array).
         # Копируем только существующие элементы (до _size).
-        for i in range(self._size):
-            new_array[i] = self.array[i]
+        # Присваивание срезу копирует их одним блоком в C, а не по одному в цикле Python.
+        new_array[:self._size] = self.array[:self._size]
         # Заменяем старый внутренний массив на новый, увеличенного размера.
         self.array = new_array
         # Обновляем атрибут _capacity, чтобы он соответствовал новой емкости.
         self._capacity = new_capacity
+        self._resize_count += 1
 
     # Магический метод для получения элемента по индексу (например, my_array[index]).
+    # Срез (my_array[a:b]) в типизированном режиме возвращает memoryview без копирования.
     def __getitem__(self, index):
+        if isinstance(index, slice):
+            return self._values()[index]
         # Проверяем, находится ли запрошенный индекс в допустимых границах.
         # Допустимые индексы: от 0 включительно до _size (текущее количество элементов) не включительно.
         if not 0 <= index < self._size:
@@ -98,6 +229,144 @@ class MyDynamicArray:
         # Присваиваем новое значение элементу во внутреннем массиве по указанному индексу.
         self.array[index] = value
 
+    # Возвращает memoryview на заполненную часть массива (без копирования).
+    # Только для типизированного режима. При увеличении емкости массив переезжает в новый буфер,
+    # поэтому ранее полученный memoryview продолжает смотреть на старые данные.
+    def memoryview(self):
+        if self.typecode is None:
+            raise TypeError("memoryview is only available for typed arrays")
+        return memoryview(self.array)[:self._size]
+
+    # Протокол буфера (PEP 688, Python 3.12+): memoryview(arr), bytes(arr) и т.п.
+    def __buffer__(self, flags):
+        return self.memoryview()
+
+    # Элементы массива: memoryview без копирования в типизированном режиме, копия списка - в обычном.
+    def _values(self):
+        if self.typecode is None:
+            return self.array[:self._size]
+        return self.memoryview()
+
+    # ndarray поверх буфера массива (без копирования) или None, если NumPy недоступен.
+    def _numpy(self):
+        if np is None or self.typecode is None or self._size == 0:
+            return None
+        return np.frombuffer(self.memoryview(), dtype=self.typecode)
+
+    # Новый массив того же типа, хранилищем которого становится storage.
+    def _wrap(self, storage):
+        result = MyDynamicArray(self.typecode, self._growth)
+        if len(storage):
+            result.array = storage
+        result._size = len(storage)
+        result._capacity = len(result.array)
+        return result
+
+    # Новый массив из результата NumPy с приведением к типу этого массива.
+    def _wrap_numpy(self, values):
+        return self._wrap(array(self.typecode, values.astype(self.typecode).tobytes()))
+
+    # Второй операнд поэлементной операции: скаляр или последовательность той же длины.
+    def _operand(self, other):
+        if isinstance(other, MyDynamicArray):
+            other = other._values()
+        if isinstance(other, str) or not hasattr(other, '__len__'):
+            return other, True
+        if len(other) != self._size:
+            raise ValueError("Operands must have the same size")
+        return other, False
+
+    # op для целочисленного массива в NumPy. NumPy молча переполняется по модулю, а array в
+    # Python-ветке бросает OverflowError - поэтому результат сначала оценивается во float64
+    # и сравнивается с границами типа, а считается точно в int64.
+    # Возвращает None, если результат надо считать в Python: uint64 (нет более широкого типа)
+    # и значения у границ 64-битного типа, где float64 неточен.
+    def _numpy_int_binary(self, op, values, operand):
+        info = np.iinfo(self.typecode)
+        if info.bits == 64 and info.min == 0:
+            return None
+        estimate = op(values.astype(np.float64), operand)
+        low, high = estimate.min(), estimate.max()
+        # погрешность float64 у границ 64-битных типов не больше 2**10
+        margin = 2 ** 11 if info.bits == 64 else 0
+        if low < info.min - margin or high > info.max + margin:
+            raise OverflowError(f"result does not fit typecode {self.typecode!r}")
+        if low < info.min + margin or high > info.max - margin:
+            return None
+        try:
+            return op(values.astype(np.int64), operand)
+        except OverflowError:
+            # скалярный операнд шире int64 - пусть считает Python
+            return None
+
+    # Применяет func к каждому элементу и возвращает новый массив того же типа.
+    def map(self, func):
+        if self.typecode is None:
+            return self._wrap(list(map(func, self._values())))
+        return self._wrap(array(self.typecode, map(func, self._values())))
+
+    # Общая часть add/scale: op(элемент, other) для числа или поэлементно.
+    def _binary(self, op, other):
+        other, scalar = self._operand(other)
+        values = self._numpy()
+        if values is not None:
+            operand = other if scalar else np.asarray(other)
+            if self.typecode in 'fd':
+                return self._wrap_numpy(op(values, operand))
+            result = self._numpy_int_binary(op, values, operand)
+            if result is not None:
+                return self._wrap_numpy(result)
+        if scalar:
+            result = map(op, self._values(), [other] * self._size)
+        else:
+            result = map(op, self._values(), other)
+        if self.typecode is None:
+            return self._wrap(list(result))
+        if self.typecode in 'fd':
+            return self._wrap(array(self.typecode, result))
+        # целочисленный массив: дробный результат отбрасывает дробную часть, как astype в NumPy
+        return self._wrap(array(self.typecode, map(int, result)))
+
+    # Поэлементная сумма с числом или с массивом той же длины.
+    def add(self, other):
+        return self._binary(operator.add, other)
+
+    # Умножение всех элементов на число (или поэлементно на массив той же длины).
+    def scale(self, factor):
+        return self._binary(operator.mul, factor)
+
+    # Сумма элементов.
+    def sum(self):
+        values = self._numpy()
+        if values is not None:
+            # целочисленная сумма в NumPy может переполниться - тогда считаем точно в Python
+            if self.typecode in 'fd' or self._size * max(-int(values.min()), int(values.max())) < 2 ** 63:
+                return values.sum().item()
+        return sum(self._values())
+
+    # Минимальный элемент (ValueError для пустого массива).
+    def min(self):
+        values = self._numpy()
+        if values is not None:
+            return values.min().item()
+        return min(self._values())
+
+    # Максимальный элемент (ValueError для пустого массива).
+    def max(self):
+        values = self._numpy()
+        if values is not None:
+            return values.max().item()
+        return max(self._values())
+
+    # Индексы элементов в порядке возрастания (устойчивая сортировка), массив типа 'q'.
+    def argsort(self):
+        values = self._numpy()
+        if values is not None:
+            order = np.argsort(values, kind='stable').astype('q')
+            return MyDynamicArray.from_iterable(array('q', order.tobytes()), typecode='q')
+        order = sorted(range(self._size), key=self._values().__getitem__)
+        return MyDynamicArray.from_iterable(order, typecode='q')
+
 
 def process_commands():
     arr = MyDynamicArray()
@@ -116,6 +385,344 @@ def process_commands():
             print(arr[index])
 
 
+# Токены (bytes) из бинарного потока, прочитанного блоками по chunk_size байт.
+# Токен, разрезанный границей блока, склеивается со следующим блоком.
+def _read_tokens(stream, chunk_size=1 << 16):
+    tail = b''
+    while True:
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        tokens = (tail + chunk).split()
+        # если блок закончился посреди токена, откладываем его до следующего блока
+        tail = b'' if chunk[-1:].isspace() or not tokens else tokens.pop()
+        yield from tokens
+    if tail:
+        yield tail
+
+
+# Потоковая версия process_commands: те же команды и тот же вывод, но без input()/print
+# на каждую строку. stdin/stdout - бинарные потоки (по умолчанию sys.stdin.buffer и sys.stdout.buffer).
+def process_commands_fast(stdin=None, stdout=None):
+    import sys
+
+    stdin = stdin if stdin is not None else sys.stdin.buffer
+    stdout = stdout if stdout is not None else sys.stdout.buffer
+    tokens = _read_tokens(stdin)
+    arr = MyDynamicArray()
+    output = []
+    write = output.append
+    # Таблица обработчиков вместо цепочки if/elif. Аргумент команды (если есть) - следующий токен.
+    handlers = {
+        b'push_back': lambda: arr.push_back(int(next(tokens))),
+        b'pop_back': lambda: write(arr.pop_back()),
+        b'size': lambda: write(arr.size()),
+        b'index': lambda: write(arr[int(next(tokens))]),
+    }
+    n = int(next(tokens))
+    for _ in range(n):
+        handler = handlers.get(next(tokens))
+        # неизвестные команды пропускаются, как и в process_commands
+        if handler is not None:
+            handler()
+    if output:
+        stdout.write(('\n'.join(map(str, output)) + '\n').encode())
+    stdout.flush()
+
+
+# Синтетический поток из n команд для process_commands (bytes). Команды всегда корректны:
+# pop_back и index выдаются только для непустого массива.
+def generate_commands(n, seed=0):
+    import random
+
+    rng = random.Random(seed)
+    lines = [str(n)]
+    size = 0
+    for _ in range(n):
+        action = rng.random()
+        if size == 0 or action < 0.5:
+            lines.append('push_back')
+            lines.append(str(rng.randrange(10 ** 9)))
+            size += 1
+        elif action < 0.65:
+            lines.append('pop_back')
+            size -= 1
+        elif action < 0.8:
+            lines.append('size')
+        else:
+            lines.append('index')
+            lines.append(str(rng.randrange(size)))
+    return ('\n'.join(lines) + '\n').encode()
+
+
+# Сравнивает process_commands и process_commands_fast на потоке из n команд.
+# Каждый режим запускается отдельным процессом со stdin из файла, как при реальном повторе.
+def run_commands_benchmark(n=10 ** 6):
+    import os
+    import subprocess
+    import sys
+    import tempfile
+    import time
+
+    n = int(n)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'commands.txt')
+        with open(path, 'wb') as f:
+            f.write(generate_commands(n))
+        outputs = {}
+        print(f'n={n}')
+        for mode, args in (('input/print', []), ('fast', ['--fast'])):
+            with open(path, 'rb') as stdin:
+                started = time.perf_counter()
+                result = subprocess.run([sys.executable, __file__] + args, stdin=stdin,
+                                        capture_output=True, check=True)
+                elapsed = time.perf_counter() - started
+            outputs[mode] = result.stdout
+            print(f'{mode:>12}: {elapsed:.2f} s')
+        assert outputs['input/print'] == outputs['fast']
+
+
+# Строит массив из n элементов через push_back и печатает число перевыделений,
+# итоговую емкость и пиковую память процесса (ru_maxrss). Запускается в отдельном процессе.
+def _growth_benchmark_child(policy, n, typecode):
+    import resource
+    import time
+
+    arr = MyDynamicArray(typecode=typecode, growth=policy)
+    started = time.perf_counter()
+    for i in range(n):
+        arr.push_back(i)
+    elapsed = time.perf_counter() - started
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(arr._resize_count, arr.capacity(), elapsed, peak)
+
+
+# Сравнивает политики роста. Каждая политика измеряется в отдельном процессе,
+# чтобы пиковая память одной не влияла на другую. ru_maxrss в Linux - в килобайтах.
+def run_growth_benchmark(n=10 ** 6, typecode='q'):
+    import subprocess
+    import sys
+
+    n = int(n)
+    if typecode == 'None':
+        typecode = None
+    print(f'n={n}, typecode={typecode}')
+    print(f'{"policy":>8} {"reallocs":>9} {"capacity":>10} {"time, s":>8} {"peak RSS, MB":>13}')
+    for policy in GROWTH_POLICIES:
+        output = subprocess.run(
+            [sys.executable, __file__, '--bench-growth-child', policy, str(n), str(typecode)],
+            check=True, capture_output=True, text=True,
+        ).stdout.split()
+        reallocs, capacity, elapsed, peak = int(output[0]), int(output[1]), float(output[2]), int(output[3])
+        print(f'{policy:>8} {reallocs:>9} {capacity:>10} {elapsed:>8.2f} {peak / 1024:>13.1f}')
+
+
+import unittest
+
+
+class TestMyDynamicArray(unittest.TestCase):
+    def test_push_pop_and_index(self):
+        arr = MyDynamicArray()
+        for i in range(10):
+            arr.push_back(i)
+        self.assertEqual(arr.size(), 10)
+        self.assertEqual(arr.capacity(), 16)
+        arr[3] = 'x'
+        self.assertEqual(arr[3], 'x')
+        self.assertEqual(arr.pop_back(), 9)
+        with self.assertRaises(IndexError):
+            arr[9]
+
+    def test_typed_array(self):
+        arr = MyDynamicArray(typecode='q')
+        for i in range(100):
+            arr.push_back(i * 1000)
+        self.assertIsInstance(arr.array, array)
+        self.assertEqual(arr[99], 99000)
+        self.assertEqual(arr.pop_back(), 99000)
+        with self.assertRaises(TypeError):
+            arr.push_back('x')
+
+    def test_extend_and_from_iterable(self):
+        arr = MyDynamicArray.from_iterable(range(1000))
+        self.assertEqual(arr.size(), 1000)
+        self.assertEqual(arr.capacity(), 1000)
+        arr.extend(x for x in 'ab')
+        self.assertEqual(arr.capacity(), 2000)
+        self.assertEqual((arr[999], arr[1000], arr[1001]), (999, 'a', 'b'))
+        arr.extend([])
+        self.assertEqual(arr.size(), 1002)
+
+        typed = MyDynamicArray.from_iterable(range(10), typecode='q')
+        typed.extend(array('q', [10, 11]))
+        typed.extend(iter([12]))
+        self.assertEqual(typed.memoryview().tolist(), list(range(13)))
+        self.assertEqual(typed.array.typecode, 'q')
+
+    def test_growth_policies(self):
+        for name in GROWTH_POLICIES:
+            arr = MyDynamicArray(growth=name)
+            for i in range(10000):
+                arr.push_back(i)
+            self.assertEqual(arr.size(), 10000)
+            self.assertGreaterEqual(arr.capacity(), 10000)
+            self.assertEqual(arr[9999], 9999)
+        doubling = MyDynamicArray()
+        for i in range(1000):
+            doubling.push_back(i)
+        self.assertEqual(doubling._resize_count, 10)
+        chunked = MyDynamicArray(growth=growth_chunk(100))
+        for i in range(1000):
+            chunked.push_back(i)
+        self.assertEqual(chunked.capacity(), 1001)
+        custom = MyDynamicArray(growth=lambda capacity, required: required + 1)
+        custom.extend(range(5))
+        self.assertEqual(custom.capacity(), 6)
+
+    def test_reserve_and_shrink(self):
+        arr = MyDynamicArray(typecode='q')
+        arr.reserve(1000)
+        self.assertEqual(arr.capacity(), 1000)
+        arr.extend(range(1000))
+        self.assertEqual(arr._resize_count, 1)
+        for _ in range(990):
+            arr.pop_back()
+        # reserve не дает сжиматься
+        self.assertEqual(arr.capacity(), 1000)
+        arr.shrink_to_fit()
+        self.assertEqual(arr.capacity(), 10)
+        arr.extend(range(90))
+        for _ in range(80):
+            arr.pop_back()
+        # сжатие вдвое, когда заполнено меньше четверти
+        self.assertLess(arr.capacity(), 100)
+        self.assertGreaterEqual(arr.capacity(), arr.size() * 2)
+        self.assertEqual(arr.memoryview().tolist(), list(range(10)) + list(range(10)))
+
+    def test_slices(self):
+        typed = MyDynamicArray.from_iterable(range(10), typecode='q')
+        view = typed[2:8:2]
+        self.assertIsInstance(view, memoryview)
+        self.assertEqual(view.tolist(), [2, 4, 6])
+        typed[4] = 40
+        self.assertEqual(view[1], 40)
+        self.assertEqual(typed[::-1].tolist()[:2], [9, 8])
+        # срез не выходит за size, даже если емкость больше
+        typed.pop_back()
+        self.assertEqual(len(typed[5:100]), 4)
+        plain = MyDynamicArray.from_iterable('abcde')
+        self.assertEqual(plain[1:3], ['b', 'c'])
+
+    def test_vector_operations(self):
+        arr = MyDynamicArray.from_iterable([3, 1, 2, 5, 4], typecode='q')
+        self.assertEqual(arr.sum(), 15)
+        self.assertEqual((arr.min(), arr.max()), (1, 5))
+        self.assertEqual(arr.map(lambda x: x * x).memoryview().tolist(), [9, 1, 4, 25, 16])
+        self.assertEqual(arr.add(10).memoryview().tolist(), [13, 11, 12, 15, 14])
+        self.assertEqual(arr.add(arr).memoryview().tolist(), [6, 2, 4, 10, 8])
+        self.assertEqual(arr.scale(2).memoryview().tolist(), [6, 2, 4, 10, 8])
+        self.assertEqual(arr.scale(0.5).memoryview().tolist(), [1, 0, 1, 2, 2])
+        self.assertEqual(arr.argsort().memoryview().tolist(), [1, 2, 0, 4, 3])
+        self.assertEqual(arr.argsort().typecode, 'q')
+        with self.assertRaises(ValueError):
+            arr.add([1, 2])
+
+        floats = MyDynamicArray.from_iterable([0.5, 1.5], typecode='d')
+        self.assertEqual(floats.scale(2).memoryview().tolist(), [1.0, 3.0])
+        self.assertEqual(floats.sum(), 2.0)
+
+        empty = MyDynamicArray(typecode='d')
+        self.assertEqual(empty.sum(), 0)
+        self.assertEqual(empty.add(1).size(), 0)
+        with self.assertRaises(ValueError):
+            empty.min()
+
+        plain = MyDynamicArray.from_iterable(['b', 'a', 'c'])
+        self.assertEqual(plain.argsort().memoryview().tolist(), [1, 0, 2])
+        self.assertEqual(plain.add('!')[0:3], ['b!', 'a!', 'c!'])
+
+    # NumPy и Python-ветка одинаково бросают OverflowError, если результат не влезает в тип
+    def _check_overflow(self):
+        small = MyDynamicArray.from_iterable([200, 100], typecode='B')
+        with self.assertRaises(OverflowError):
+            small.add(100)
+        with self.assertRaises(OverflowError):
+            small.scale(2)
+        self.assertEqual(small.add(55).memoryview().tolist(), [255, 155])
+        self.assertEqual(small.add(-100).memoryview().tolist(), [100, 0])
+        with self.assertRaises(OverflowError):
+            small.add(-101)
+        self.assertEqual(small.add(small.scale(0.25)).memoryview().tolist(), [250, 125])
+        big = MyDynamicArray.from_iterable([2 ** 62, 2 ** 62], typecode='q')
+        with self.assertRaises(OverflowError):
+            big.add(big)
+        self.assertEqual(big.add(2 ** 62 - 1).memoryview().tolist(), [2 ** 63 - 1] * 2)
+        self.assertEqual(big.sum(), 2 ** 63)
+
+    def test_overflow_without_numpy(self):
+        from unittest import mock
+
+        with mock.patch(f'{__name__}.np', None):
+            self._check_overflow()
+
+    @unittest.skipIf(np is None, "numpy is not installed")
+    def test_overflow_with_numpy(self):
+        self._check_overflow()
+
+    def test_process_commands_fast(self):
+        import io
+        from contextlib import redirect_stdout
+        from unittest import mock
+
+        commands = b'7\npush_back\n5\npush_back\n  12\nsize\nindex\n1\nunknown\npop_back\nsize\n'
+        stdout = io.BytesIO()
+        process_commands_fast(io.BytesIO(commands), stdout)
+        self.assertEqual(stdout.getvalue(), b'2\n12\n12\n1\n')
+
+        # на синтетическом потоке вывод совпадает с process_commands
+        stream = generate_commands(300, seed=1)
+        fast = io.BytesIO()
+        process_commands_fast(io.BytesIO(stream), fast)
+        slow = io.StringIO()
+        lines = iter(stream.decode().splitlines())
+        with mock.patch('builtins.input', lambda: next(lines)), redirect_stdout(slow):
+            process_commands()
+        self.assertEqual(fast.getvalue().decode(), slow.getvalue())
+
+    def test_read_tokens_across_chunks(self):
+        import io
+
+        data = b'push_back 123456 pop_back\n size'
+        for chunk_size in (1, 2, 3, 7, 100):
+            tokens = list(_read_tokens(io.BytesIO(data), chunk_size))
+            self.assertEqual(tokens, [b'push_back', b'123456', b'pop_back', b'size'])
+
+    def test_memoryview_is_zero_copy(self):
+        arr = MyDynamicArray(typecode='d')
+        for i in range(5):
+            arr.push_back(i / 2)
+        view = arr.memoryview()
+        self.assertEqual(view.format, 'd')
+        self.assertEqual(len(view), 5)
+        self.assertEqual(view.tolist(), [0.0, 0.5, 1.0, 1.5, 2.0])
+        arr[0] = 7.0
+        self.assertEqual(view[0], 7.0)
+        self.assertEqual(len(view.tobytes()), 5 * 8)
+        with self.assertRaises(TypeError):
+            MyDynamicArray().memoryview()
+
+
 if __name__ == "__main__":
-    process_commands()
+    import sys
 
+    if len(sys.argv) > 1 and sys.argv[1] == '--fast':
+        process_commands_fast()
+    elif len(sys.argv) > 1 and sys.argv[1] == '--bench-commands':
+        run_commands_benchmark(*sys.argv[2:])
+    elif len(sys.argv) > 1 and sys.argv[1] == '--bench-growth':
+        run_growth_benchmark(*sys.argv[2:])
+    elif len(sys.argv) > 1 and sys.argv[1] == '--bench-growth-child':
+        policy, n, typecode = sys.argv[2:5]
+        _growth_benchmark_child(policy, int(n), None if typecode == 'None' else typecode)
+    else:
+        process_commands()
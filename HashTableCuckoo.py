@@ -0,0 +1,261 @@
+"""
+Кукушкино хэширование (Cuckoo hashing) на двух таблицах.
+
+У каждого ключа ровно две возможные ячейки: `i1` в первой таблице и `i2` во второй
+(две независимые хэш-функции). Поэтому:
+- `find` и `pop` смотрят две ячейки (и короткую заначку, см. ниже) - худший случай O(1);
+- при `push`, если обе ячейки заняты, новый ключ "выталкивает" старого жильца (как кукушонок),
+  тот переезжает в свою ячейку в другой таблице, выталкивая следующего, и так далее.
+  Если цепочка выталкиваний длиннее `_MAX_KICKS`, значит образовался цикл - "бездомный" ключ
+  кладется в небольшой список-заначку (stash). Когда заначка переполняется, таблицы
+  перестраиваются с новыми хэш-функциями, но не больше `_MAX_REHASHES` попыток подряд.
+
+Обе ячейки ключа вычисляются из одного `hash(key)`, поэтому ключи с одинаковым `hash()`
+(например, подобранные злоумышленником) всегда конкурируют за одни и те же две ячейки,
+и никакие новые хэш-функции или увеличение таблиц их не разведут. Такие ключи остаются
+в заначке: поиск по ним деградирует до просмотра заначки, но вставка не зацикливается
+и таблицы не растут впустую.
+
+Хэш-функции - мультипликативные: старшие биты `hash(key) * A` для двух разных нечетных A.
+Хэши ключей хранятся в `array('q')`, поэтому при перестроении `hash()` повторно не вызывается.
+
+API совпадает с `HashTableOnLists`: `find`, `push`, `pop`.
+"""
+
+import random
+from array import array
+
+_MASK64 = (1 << 64) - 1
+# Значение в массиве хэшей для пустой ячейки (CPython никогда не возвращает -1 из hash()).
+_EMPTY = -1
+
+
+class HashTableCuckoo:
+    # Суммарная загрузка двух таблиц, после которой они увеличиваются.
+    # Для двух таблиц по одной ячейке на ключ выталкивания сходятся при загрузке < 0.5.
+    _MAX_LOAD = 0.45
+    # Максимальная длина цепочки выталкиваний при вставке.
+    _MAX_KICKS = 64
+    # Размер заначки, после которого таблицы перестраиваются.
+    _MAX_STASH = 4
+    # Сколько раз подряд пробовать новые хэш-функции при перестроении.
+    _MAX_REHASHES = 5
+
+    # конструктор класса (capacity - размер каждой из двух таблиц)
+    def __init__(self, capacity=8, seed=None):
+        self._random = random.Random(seed)
+        self._bits = 3
+        while (1 << self._bits) < capacity:
+            self._bits += 1
+        self._size = 0
+        # ключи, которым не нашлось места ни в одной из двух ячеек: список (хэш, ключ)
+        self._stash = []
+        # перестроение запускается, когда заначка длиннее этого порога
+        self._stash_limit = self._MAX_STASH
+        self._new_hash_functions()
+        self._init_tables()
+
+    # выбирает две новые случайные нечетные константы для хэш-функций
+    def _new_hash_functions(self):
+        self._a1 = self._random.getrandbits(64) | 1
+        self._a2 = self._random.getrandbits(64) | 1
+
+    # создаёт пустые таблицы текущего размера
+    def _init_tables(self):
+        capacity = 1 << self._bits
+        self._capacity = capacity
+        self._hashes1 = array('q', [_EMPTY]) * capacity
+        self._hashes2 = array('q', [_EMPTY]) * capacity
+        self._keys1 = [None] * capacity
+        self._keys2 = [None] * capacity
+
+    # ячейка ключа в первой таблице
+    def _index1(self, h):
+        return ((h * self._a1) & _MASK64) >> (64 - self._bits)
+
+    # ячейка ключа во второй таблице
+    def _index2(self, h):
+        return ((h * self._a2) & _MASK64) >> (64 - self._bits)
+
+    # ищет ключ, возвращает (номер таблицы, индекс) или None
+    def _lookup(self, key, h):
+        i = self._index1(h)
+        if self._hashes1[i] == h:
+            k = self._keys1[i]
+            if k is key or k == key:
+                return 1, i
+        i = self._index2(h)
+        if self._hashes2[i] == h:
+            k = self._keys2[i]
+            if k is key or k == key:
+                return 2, i
+        for i, (stashed_h, k) in enumerate(self._stash):
+            if stashed_h == h and (k is key or k == key):
+                return 0, i
+        return None
+
+    # находит и возвращает элемент по ключу: две ячейки плюс просмотр заначки
+    # (обычно пустой или из нескольких ключей; длинной она бывает только из-за ключей с равным hash())
+    def find(self, key):
+        found = self._lookup(key, hash(key))
+        if found is None:
+            return None
+        table, i = found
+        if table == 0:
+            return self._stash[i][1]
+        return self._keys1[i] if table == 1 else self._keys2[i]
+
+    # вставляет элемент
+    def push(self, key):
+        h = hash(key)
+        if self._lookup(key, h) is not None:
+            print(f'{key} есть в таблице.')
+            return
+        if self._size + 1 > 2 * self._capacity * self._MAX_LOAD:
+            self._rehash(grow=True)
+        self._size += 1
+        h, key = self._insert(h, key)
+        if h != _EMPTY:
+            # цикл выталкиваний - "бездомный" ключ уходит в заначку,
+            # а переполненная заначка - повод перестроить таблицы
+            self._stash.append((h, key))
+            if len(self._stash) > self._stash_limit:
+                self._rehash(grow=False)
+
+    # цепочка выталкиваний; возвращает (_EMPTY, None) при успехе или бездомный элемент
+    def _insert(self, h, key):
+        for _ in range(self._MAX_KICKS):
+            i = self._index1(h)
+            h, self._hashes1[i] = self._hashes1[i], h
+            key, self._keys1[i] = self._keys1[i], key
+            if h == _EMPTY:
+                return _EMPTY, None
+            i = self._index2(h)
+            h, self._hashes2[i] = self._hashes2[i], h
+            key, self._keys2[i] = self._keys2[i], key
+            if h == _EMPTY:
+                return _EMPTY, None
+        return h, key
+
+    # удаляет и возвращает элемент
+    def pop(self, key):
+        found = self._lookup(key, hash(key))
+        if found is None:
+            return None
+        table, i = found
+        if table == 0:
+            removed = self._stash.pop(i)[1]
+        elif table == 1:
+            removed = self._keys1[i]
+            self._hashes1[i] = _EMPTY
+            self._keys1[i] = None
+        else:
+            removed = self._keys2[i]
+            self._hashes2[i] = _EMPTY
+            self._keys2[i] = None
+        self._size -= 1
+        return removed
+
+    # Приватный метод перестроения: новые хэш-функции и (опционально) удвоенный размер.
+    # Ключи, которые не удалось разместить, попадают в заначку. Если она все равно
+    # переполнена, пробуем другие функции, но не больше _MAX_REHASHES раз: ключи с одинаковым
+    # hash() не развести ничем, и тогда заначка просто остается длиннее обычного.
+    def _rehash(self, grow):
+        entries = [(h, k) for h, k in zip(self._hashes1, self._keys1) if h != _EMPTY]
+        entries += [(h, k) for h, k in zip(self._hashes2, self._keys2) if h != _EMPTY]
+        entries += self._stash
+        if grow:
+            self._bits += 1
+        for _ in range(self._MAX_REHASHES):
+            self._new_hash_functions()
+            self._init_tables()
+            stash = []
+            for h, key in entries:
+                h, key = self._insert(h, key)
+                if h != _EMPTY:
+                    stash.append((h, key))
+            if len(stash) <= self._MAX_STASH:
+                break
+        self._stash = stash
+        # Следующее перестроение - только когда заначка вырастет вдвое,
+        # чтобы неразрешимые коллизии не вызывали перестроение на каждой вставке.
+        self._stash_limit = max(self._MAX_STASH, 2 * len(stash))
+
+    def __len__(self):
+        return self._size
+
+    def __contains__(self, key):
+        return self._lookup(key, hash(key)) is not None
+
+    # Строковое представление объекта (только живые ключи)
+    def __str__(self):
+        keys = [k for h, k in zip(self._hashes1, self._keys1) if h != _EMPTY]
+        keys += [k for h, k in zip(self._hashes2, self._keys2) if h != _EMPTY]
+        keys += [k for _, k in self._stash]
+        return str(keys)
+
+
+# Тесты
+import unittest
+
+
+class TestHashTableCuckoo(unittest.TestCase):
+    def setUp(self):
+        self.table = HashTableCuckoo(seed=1)
+
+    def test_push_find_pop(self):
+        self.table.push("apple")
+        self.table.push("banana")
+        self.table.push("apple")
+        self.assertEqual(len(self.table), 2)
+        self.assertEqual(self.table.find("apple"), "apple")
+        self.assertIsNone(self.table.find("orange"))
+        self.assertEqual(self.table.pop("apple"), "apple")
+        self.assertIsNone(self.table.pop("apple"))
+        self.assertEqual(self.table.find("banana"), "banana")
+
+    def test_many_keys(self):
+        keys = [i * 1024 for i in range(5000)] + [f"key{i}" for i in range(5000)]
+        for key in keys:
+            self.table.push(key)
+        self.assertEqual(len(self.table), 10000)
+        self.assertEqual(len(str(self.table).split(",")), 10000)
+        for key in keys:
+            self.assertEqual(self.table.find(key), key)
+        for key in keys[::2]:
+            self.assertEqual(self.table.pop(key), key)
+        for i, key in enumerate(keys):
+            self.assertEqual(key in self.table, i % 2 == 1)
+
+    def test_each_key_in_one_of_two_cells(self):
+        for i in range(1000):
+            self.table.push(i)
+        for i in range(1000):
+            h = hash(i)
+            self.assertTrue(
+                self.table._keys1[self.table._index1(h)] == i
+                or self.table._keys2[self.table._index2(h)] == i
+            )
+
+    def test_keys_with_equal_hash(self):
+        # для int в CPython hash(x) == hash(x + M), где M = 2^61 - 1 (на 64-битных платформах)
+        M = (1 << 61) - 1
+        colliding = [5 + j * M for j in range(50)]
+        self.assertEqual(len({hash(key) for key in colliding}), 1)
+        keys = colliding + list(range(100, 1100))
+        for key in keys:
+            self.table.push(key)
+        self.assertEqual(len(self.table), 1050)
+        # таблицы не раздуваются из-за неразрешимых коллизий
+        self.assertLessEqual(self.table._capacity, 4096)
+        for key in keys:
+            self.assertEqual(self.table.find(key), key)
+        for key in colliding[::2]:
+            self.assertEqual(self.table.pop(key), key)
+        for j, key in enumerate(colliding):
+            self.assertEqual(key in self.table, j % 2 == 1)
+        self.assertEqual(len(str(self.table).split(",")), 1025)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,6 +2,10 @@
 
 """
 
+import time
+
+from BloomFilter import CountingBloomFilter
+
 
 class HashTableOnLists:
 
@@ -63,64 +67,6 @@ class HashTableOnLists:
     def __str__(self):
         return str(self.array)
 
-# Тесты
-import unittest
-
-class TestHashTableOnLists(unittest.TestCase):
-    def setUp(self):
-        self.table = HashTableOnLists()
-
-    def test_push_and_find(self):
-        self.table.push("apple")
-        self.table.push("banana")
-        self.assertEqual(self.table.find("apple"), "apple")
-        self.assertEqual(self.table.find("banana"), "banana")
-        self.assertIsNone(self.table.find("orange"))
-
-    def test_no_duplicates(self):
-        self.table.push("apple")
-        self.table.push("apple")  # вторая вставка не должна увеличить размер
-        self.assertEqual(self.table._size, 1)
-        self.assertEqual(self.table.find("apple"), "apple")
-
-    def test_pop_existing(self):
-        self.table.push("apple")
-        result = self.table.pop("apple")
-        self.assertEqual(result, "apple")
-        self.assertIsNone(self.table.find("apple"))
-        self.assertEqual(self.table._size, 0)
-
-    def test_pop_non_existing(self):
-        result = self.table.pop("nonexistent")
-        self.assertIsNone(result)
-
-    def test_resize(self):
-        for i in range(20):  # должно триггернуть resize
-            self.table.push(f"key{i}")
-        self.assertGreaterEqual(self.table._capacity, 20)
-        for i in range(20):
-            self.assertEqual(self.table.find(f"key{i}"), f"key{i}")
-
-    def test_table_structure_after_operations(self):
-        self.table.push("apple")
-        self.table.push("banana")
-        self.table.pop("apple")
-        structure = str(self.table)
-        self.assertIn("banana", structure)
-        self.assertNotIn("apple", structure)
-
-if __name__ == "__main__":
-    unittest.main()
-
-
-"""
-Ran 6 tests in 0.003s
-
-OK
-
-Process finished with exit code 0
-"""
-
 
 # Закоментированный код для лучшего понимания и повторения.
 
@@ -131,13 +77,29 @@ class HashTableOnLists:
     в котором хранятся ключи с одинаковым хэш-значением.
     """
 
-    def __init__(self, capacity=10):
+    def __init__(self, capacity=10, incremental=False, rehash_step=4, stats=False,
+                 bloom=False, bloom_fp_rate=0.01):
         """
         Инициализатор класса (конструктор).
 
         Args:
             capacity (int): Начальная емкость хэш-таблицы (количество "корзин").
                             По умолчанию равно 10.
+            incremental (bool): Если True, рехэширование выполняется постепенно
+                                (как в Redis): старый и новый массивы живут одновременно,
+                                и каждая операция переносит не более `rehash_step` корзин.
+            rehash_step (int): Количество корзин, переносимых за одну операцию
+                               в режиме `incremental`.
+            stats (bool): Если True, таблица считает попадания/промахи `find`,
+                          количество и суммарное время рехэширований (см. `stats()`).
+                          При выключенной статистике стоимость - одна проверка флага.
+            bloom (bool): Если True, перед корзинами проверяется счетный фильтр Блума
+                          (`CountingBloomFilter`): большинство промахов `find` отсекается
+                          несколькими проверками счетчиков, без обращения к корзинам.
+                          Проверка фильтра сама выполняется на Python, поэтому выигрыш
+                          есть, когда промах в корзине дорогой (длинные цепочки, дорогой `==`);
+                          при коротких цепочках фильтр может быть медленнее самих корзин.
+            bloom_fp_rate (float): Желаемая доля ложных срабатываний фильтра Блума.
         """
         # Сохраняем заданную емкость. Емкость определяет размер внутреннего массива.
         self._capacity = capacity
@@ -147,6 +109,30 @@ class HashTableOnLists:
         # Эти вложенные списки будут "корзинами" или "цепочками" для хранения ключей.
         # Длина основного массива равна заданной емкости (_capacity).
         self.array = [[] for _ in range(self._capacity)]
+        # Параметры прогрессивного рехэширования.
+        self._incremental = incremental
+        self._rehash_step = rehash_step
+        # Шаг текущего переноса (не меньше rehash_step, см. _resize).
+        self._current_step = rehash_step
+        # Старый массив корзин, из которого еще идет перенос (None - перенос не идет).
+        self._old_array = None
+        # Индекс первой еще не перенесенной корзины старого массива.
+        self._rehash_index = 0
+        # Нижняя граница емкости при сжатии (начальная емкость или заданная через reserve).
+        self._initial_capacity = capacity
+        self._min_capacity = capacity
+        # Счетчики статистики (обновляются только при stats=True).
+        self._stats = stats
+        self._find_hits = 0
+        self._find_misses = 0
+        self._resize_count = 0
+        self._resize_time = 0.0
+        # Фильтр Блума для текущего массива корзин (и для старого - во время переноса).
+        # Фильтр рассчитан на максимальную загрузку массива (0.75 * capacity) и
+        # всегда отражает содержимое "своего" массива.
+        self._bloom_fp_rate = bloom_fp_rate
+        self._bloom = self._new_bloom() if bloom else None
+        self._old_bloom = None
 
     def _hash(self, key):
         """
@@ -175,17 +161,39 @@ class HashTableOnLists:
         Returns:
             Найденный ключ, если он существует в таблице, иначе None.
         """
+        # 0. Если идет прогрессивное рехэширование, переносим очередную порцию корзин.
+        if self._old_array is not None:
+            self._rehash_some()
+        # 0.5. Если фильтр Блума говорит, что ключа точно нет, корзины не трогаем.
+        if self._bloom is not None and not self._bloom_might_contain(key):
+            if self._stats:
+                self._find_misses += 1
+            return None
         # 1. Вычисляем индекс корзины, где мог бы находиться ключ.
         index = self._hash(key)
         # 2. Получаем саму корзину (список) по вычисленному индексу.
         bucket = self.array[index]
         # 3. Проходим по всем элементам (ключам) в найденной корзине.
-        for k in bucket:
-            # 4. Если находим искомый ключ...
-            if k == key:
-                # ...возвращаем его.
-                return k
-        # 5. Если мы прошли всю корзину и не нашли ключ, значит его нет в таблице.
+        #    (В режиме incremental пустая корзина может быть None.)
+        if bucket:
+            for k in bucket:
+                # 4. Если находим искомый ключ...
+                if k == key:
+                    # ...возвращаем его.
+                    if self._stats:
+                        self._find_hits += 1
+                    return k
+        # 5. Ключ может еще лежать в не перенесенной корзине старого массива.
+        old_bucket = self._old_bucket(key)
+        if old_bucket:
+            for k in old_bucket:
+                if k == key:
+                    if self._stats:
+                        self._find_hits += 1
+                    return k
+        # 6. Если мы прошли всю корзину и не нашли ключ, значит его нет в таблице.
+        if self._stats:
+            self._find_misses += 1
         return None
 
     def push(self, key):
@@ -198,14 +206,23 @@ class HashTableOnLists:
         Args:
             key: Ключ, который нужно вставить.
         """
+        # 0. Если идет прогрессивное рехэширование, переносим очередную порцию корзин.
+        if self._old_array is not None:
+            self._rehash_some()
         # 1. Вычисляем индекс корзины для ключа.
         index = self._hash(key)
-        # 2. Получаем корзину по индексу.
+        # 2. Получаем корзину по индексу (в режиме incremental создаем ее по требованию).
         bucket = self.array[index]
-        # 3. Проверяем, нет ли уже такого ключа в этой корзине.
-        if key not in bucket:
+        if bucket is None:
+            bucket = self.array[index] = []
+        # 3. Проверяем, нет ли уже такого ключа в этой корзине
+        #    (и в не перенесенной корзине старого массива).
+        old_bucket = self._old_bucket(key)
+        if key not in bucket and not (old_bucket and key in old_bucket):
             # 4. Если ключа нет, добавляем его в конец списка (цепочки) этой корзины.
             bucket.append(key)
+            if self._bloom is not None:
+                self._bloom.add(key)
             # 5. Увеличиваем счетчик общего количества элементов в таблице.
             self._size += 1
             # 6. Проверяем коэффициент загрузки (load factor).
@@ -232,49 +249,388 @@ class HashTableOnLists:
         Returns:
             Удаленный ключ, если он был найден и удален, иначе None.
         """
+        # 0. Если идет прогрессивное рехэширование, переносим очередную порцию корзин.
+        if self._old_array is not None:
+            self._rehash_some()
         # 1. Вычисляем индекс корзины, где должен находиться ключ.
         index = self._hash(key)
         # 2. Получаем корзину по индексу.
         bucket = self.array[index]
-        # 3. Проверяем, есть ли ключ в этой корзине.
-        if key in bucket:
+        # 3. Ключ лежит либо в новой корзине, либо в не перенесенной корзине старого массива.
+        #    (Фильтр Блума каждого массива уменьшаем вместе с его корзиной.)
+        bloom = self._bloom
+        if not (bucket and key in bucket):
+            bucket = self._old_bucket(key)
+            bloom = self._old_bloom
+        if bucket and key in bucket:
             # 4. Если есть, удаляем его из списка корзины.
             bucket.remove(key)
+            if bloom is not None:
+                bloom.remove(key)
             # 5. Уменьшаем счетчик общего количества элементов.
             self._size -= 1
-            # 6. Возвращаем удаленный ключ.
+            # 6. Если таблица опустела ниже нижнего порога загрузки (0.1),
+            #    вдвое уменьшаем массив корзин, чтобы вернуть память.
+            #    Между порогами 0.1 и 0.75 остается запас, поэтому таблица
+            #    не "дребезжит" между сжатием и расширением.
+            if self._capacity > self._min_capacity and self._size < self._capacity * 0.1:
+                self._resize(max(self._capacity // 2, self._min_capacity))
+            # 7. Возвращаем удаленный ключ.
             return key
         else:
-            # 7. Если ключ не найден в корзине, возвращаем None.
+            # 8. Если ключ не найден в корзине, возвращаем None.
             return None
 
-    def _resize(self):
+    def _resize(self, new_capacity=None):
         """
-        Приватный вспомогательный метод для увеличения размера хэш-таблицы (рехэширования).
-        Вызывается, когда коэффициент загрузки превышает пороговое значение (0.75).
-        Создает новый массив большего размера и переносит в него все существующие элементы,
+        Приватный вспомогательный метод для изменения размера хэш-таблицы (рехэширования).
+        Вызывается, когда коэффициент загрузки превышает пороговое значение (0.75)
+        или, при удалении, опускается ниже нижнего порога (0.1).
+        Создает новый массив и переносит в него все существующие элементы,
         пересчитывая их хэши с учетом новой емкости.
+
+        В режиме `incremental` элементы не переносятся сразу: старый массив
+        запоминается в `_old_array`, а перенос выполняет `_rehash_some`
+        понемногу при каждом вызове `find`/`push`/`pop`.
+
+        Args:
+            new_capacity (int, optional): Новая емкость. По умолчанию - удвоенная текущая.
+        """
+        if new_capacity is None:
+            new_capacity = self._capacity * 2
+        if self._incremental:
+            # Предыдущий перенос еще не закончен - доводим его до конца,
+            # одновременно живут не больше двух массивов.
+            if self._old_array is not None:
+                self._finish_rehash()
+            if self._stats:
+                self._resize_count += 1
+            self._old_array = self.array
+            self._rehash_index = 0
+            self._capacity = new_capacity
+            # Перенос должен закончиться раньше, чем сработает следующий _resize,
+            # иначе тот перенесет весь остаток за одну операцию. После сжатия до
+            # нижнего порога всего ~0.05 * capacity удалений, поэтому шаг
+            # пересчитывается из числа операций, оставшихся до ближайшего порога.
+            ops_left = int(new_capacity * 0.75) - self._size
+            if new_capacity > self._min_capacity:
+                ops_left = min(ops_left, self._size - int(new_capacity * 0.1))
+            self._current_step = max(self._rehash_step, -(-len(self._old_array) // max(ops_left, 1)))
+            # Старый фильтр обслуживает старый массив до конца переноса,
+            # новый заполняется по мере переноса корзин.
+            if self._bloom is not None:
+                self._old_bloom = self._bloom
+                self._bloom = self._new_bloom()
+            # Корзины нового массива создаются по требованию: [None] * n
+            # выделяется одним блоком и не создает миллион пустых списков разом.
+            self.array = [None] * self._capacity
+            return
+        self._rebuild(new_capacity)
+
+    def _rebuild(self, new_capacity):
+        """
+        Сразу переносит все элементы в новый массив емкостью `new_capacity`.
+        Используется обычным `_resize`, а также `reserve` и `compact`.
         """
+        # 0. Если идет прогрессивный перенос, сначала заканчиваем его.
+        self._finish_rehash()
+        if self._stats:
+            self._resize_count += 1
+            start = time.perf_counter()
         # 1. Сохраняем ссылку на текущий (старый) массив данных.
         old_array = self.array
-        # 2. Увеличиваем емкость таблицы (обычно удваивают).
-        self._capacity *= 2
-        # 3. Создаем новый, пустой массив увеличенного размера с новой емкостью.
-        self.array = [[] for _ in range(self._capacity)]
-        # 4. Сбрасываем счетчик размера. Метод push сам корректно посчитает
-        #    количество элементов при их повторной вставке.
-        self._size = 0
-        # 5. Проходим по каждой корзине старого массива.
+        # 2. Устанавливаем новую емкость таблицы.
+        self._capacity = new_capacity
+        # 3. Создаем новый, пустой массив с новой емкостью.
+        self.array = array = [[] for _ in range(self._capacity)]
+        # 4. Проходим по каждой корзине старого массива.
         for bucket in old_array:
-            # 6. Проходим по каждому ключу в текущей старой корзине.
-            for key in bucket:
-                # 7. Вставляем ключ в *новую* таблицу с помощью метода push.
-                #    Важно: `push` внутри себя вызовет `_hash`, который теперь
-                #    использует *новую* `_capacity`, поэтому ключ попадет
-                #    в правильную корзину *нового* массива. `push` также
-                #    обновит `_size`.
-                self.push(key)
-        # print(f"Таблица увеличена, новая емкость: {self._capacity}") # Для отладки
+            # (в режиме incremental пустая корзина может быть None)
+            if bucket:
+                # 5. Кладем каждый ключ прямо в его корзину *нового* массива.
+                #    `_hash` теперь использует *новую* `_capacity`.
+                #    Ключи в таблице уникальны, поэтому повторная проверка
+                #    на дубликаты через `push` не нужна, и `_size` не меняется.
+                for key in bucket:
+                    array[self._hash(key)].append(key)
+        # 6. Фильтр Блума пересоздается под новую емкость.
+        if self._bloom is not None:
+            self._bloom = self._new_bloom()
+            for bucket in array:
+                for key in bucket:
+                    self._bloom.add(key)
+        if self._stats:
+            self._resize_time += time.perf_counter() - start
+        # print(f"Новая емкость таблицы: {self._capacity}") # Для отладки
+
+    def reserve(self, n):
+        """
+        Заранее увеличивает таблицу так, чтобы в нее поместилось `n` элементов
+        без рехэширования. Полезно перед массовой загрузкой: вместо ~log2(n)
+        перестроений выполняется одно.
+
+        Емкость, заданная через `reserve`, становится нижней границей при сжатии
+        (до вызова `compact`).
+
+        Args:
+            n (int): Ожидаемое количество элементов.
+        """
+        needed = int(n / 0.75) + 1
+        self._min_capacity = max(self._min_capacity, needed)
+        if needed > self._capacity:
+            self._rebuild(needed)
+
+    def compact(self):
+        """
+        Уменьшает таблицу до минимальной емкости, в которой текущие элементы
+        помещаются с коэффициентом загрузки не выше 0.75, и сбрасывает
+        нижнюю границу, заданную `reserve`.
+        """
+        self._min_capacity = self._initial_capacity
+        target = max(self._min_capacity, int(self._size / 0.75) + 1)
+        if target < self._capacity or self._old_array is not None:
+            self._rebuild(min(target, self._capacity))
+
+    def push_many(self, keys):
+        """
+        Пакетная вставка ключей.
+
+        В отличие от вызова `push` в цикле, хэши всего пакета считаются одним проходом
+        `map(hash, keys)`, а таблица заранее расширяется под все новые ключи пакета
+        (не более одного рехэширования). Дубликаты молча пропускаются и на размер
+        таблицы не влияют.
+
+        В режиме `incremental` пакет переносит столько корзин, сколько перенесли бы
+        `len(keys)` отдельных вызовов `push`, а не весь старый массив сразу.
+
+        Args:
+            keys: Итерируемый объект с ключами.
+
+        Returns:
+            int: Количество реально добавленных (новых) ключей.
+        """
+        keys = list(keys)
+        self._rehash_batch(len(keys))
+        # Первый проход: только новые ключи (без дубликатов внутри пакета и уже лежащих в таблице).
+        array = self.array
+        capacity = self._capacity
+        new_keys = []
+        for key, h in dict(zip(keys, map(hash, keys))).items():
+            bucket = array[h % capacity]
+            if bucket and key in bucket:
+                continue
+            old_bucket = self._old_bucket(key)
+            if old_bucket and key in old_bucket:
+                continue
+            new_keys.append((key, h))
+        # Расширяем таблицу один раз - ровно под новые ключи.
+        self._size += len(new_keys)
+        if self._size > self._capacity * 0.75:
+            self._resize(max(self._capacity * 2, int(self._size / 0.75) + 1))
+        # Второй проход: ключи заведомо новые, проверка на дубликаты не нужна.
+        array = self.array
+        capacity = self._capacity
+        bloom = self._bloom
+        for key, h in new_keys:
+            index = h % capacity
+            bucket = array[index]
+            if bucket is None:
+                array[index] = [key]
+            else:
+                bucket.append(key)
+            if bloom is not None:
+                bloom.add(key)
+        return len(new_keys)
+
+    def find_many(self, keys):
+        """
+        Пакетный поиск ключей.
+
+        Во время прогрессивного рехэширования ключ ищется и в старом массиве,
+        как в `find`; пакет переносит не больше корзин, чем `len(keys)` вызовов `find`.
+
+        Args:
+            keys: Итерируемый объект с ключами.
+
+        Returns:
+            list[bool]: Для каждого ключа - найден ли он в таблице.
+        """
+        keys = list(keys)
+        self._rehash_batch(len(keys))
+        array = self.array
+        capacity = self._capacity
+        migrating = self._old_array is not None
+        result = []
+        append = result.append
+        bloom = self._bloom
+        for key in keys:
+            if bloom is not None and not self._bloom_might_contain(key):
+                append(False)
+                continue
+            bucket = array[hash(key) % capacity]
+            if bucket and key in bucket:
+                append(True)
+            elif migrating:
+                old_bucket = self._old_bucket(key)
+                append(bool(old_bucket) and key in old_bucket)
+            else:
+                append(False)
+        if self._stats:
+            hits = sum(result)
+            self._find_hits += hits
+            self._find_misses += len(result) - hits
+        return result
+
+    def pop_many(self, keys):
+        """
+        Пакетное удаление ключей. Сжатие таблицы (если нужно) выполняется
+        один раз в конце пакета, а не на каждом удалении.
+
+        Во время прогрессивного рехэширования ключ удаляется и из старого массива,
+        как в `pop`; пакет переносит не больше корзин, чем `len(keys)` вызовов `pop`.
+
+        Args:
+            keys: Итерируемый объект с ключами.
+
+        Returns:
+            list[bool]: Для каждого ключа - был ли он удален.
+        """
+        keys = list(keys)
+        self._rehash_batch(len(keys))
+        array = self.array
+        capacity = self._capacity
+        result = []
+        append = result.append
+        removed = 0
+        for key in keys:
+            bucket = array[hash(key) % capacity]
+            bloom = self._bloom
+            if not (bucket and key in bucket):
+                bucket = self._old_bucket(key)
+                bloom = self._old_bloom
+            if bucket and key in bucket:
+                bucket.remove(key)
+                if bloom is not None:
+                    bloom.remove(key)
+                removed += 1
+                append(True)
+            else:
+                append(False)
+        self._size -= removed
+        # Сжимаем таблицу так же, как это сделали бы последовательные pop, но за один раз.
+        new_capacity = capacity
+        while new_capacity > self._min_capacity and self._size < new_capacity * 0.1:
+            new_capacity = max(new_capacity // 2, self._min_capacity)
+        if new_capacity != capacity:
+            self._resize(new_capacity)
+        return result
+
+    def _rehash_batch(self, n):
+        """
+        Продвигает прогрессивное рехэширование так, как это сделали бы `n` отдельных
+        операций: не больше `n * _current_step` корзин.
+        """
+        if self._old_array is not None and n:
+            self._rehash_some(n * self._current_step)
+
+    def _old_bucket(self, key):
+        """
+        Возвращает корзину старого массива, в которой мог остаться ключ,
+        или None, если перенос не идет или корзина уже перенесена.
+        """
+        old_array = self._old_array
+        if old_array is None:
+            return None
+        return old_array[hash(key) % len(old_array)]
+
+    def _rehash_some(self, count=None):
+        """
+        Переносит не более `count` (по умолчанию `_current_step`) корзин
+        из старого массива в новый. Ключи кладутся напрямую в корзины
+        нового массива, без повторной проверки на дубликаты.
+        """
+        if self._stats:
+            started = time.perf_counter()
+        old_array = self._old_array
+        start = self._rehash_index
+        end = min(start + (count or self._current_step), len(old_array))
+        array = self.array
+        for i in range(start, end):
+            bucket = old_array[i]
+            if bucket:
+                for key in bucket:
+                    index = self._hash(key)
+                    if array[index] is None:
+                        array[index] = [key]
+                    else:
+                        array[index].append(key)
+                    if self._bloom is not None:
+                        self._bloom.add(key)
+            # Перенесенная корзина больше не нужна.
+            old_array[i] = None
+        self._rehash_index = end
+        if end == len(old_array):
+            self._old_array = None
+            self._old_bloom = None
+        if self._stats:
+            self._resize_time += time.perf_counter() - started
+
+    def _finish_rehash(self):
+        """Доводит прогрессивное рехэширование до конца."""
+        if self._old_array is not None:
+            self._rehash_some(len(self._old_array))
+
+    def _new_bloom(self):
+        """Создает пустой фильтр Блума, рассчитанный на 0.75 * capacity ключей."""
+        return CountingBloomFilter(int(self._capacity * 0.75) + 1, self._bloom_fp_rate)
+
+    def _bloom_might_contain(self, key):
+        """
+        Проверка по фильтрам Блума обоих массивов (во время переноса ключ может
+        быть в любом из них). False - ключа в таблице точно нет.
+        """
+        if self._bloom.might_contain(key):
+            return True
+        return self._old_bloom is not None and self._old_bloom.might_contain(key)
+
+    def stats(self):
+        """
+        Возвращает снимок состояния таблицы в виде словаря (удобно для выгрузки в метрики).
+
+        Структурные показатели считаются по текущему массиву корзин за O(capacity)
+        и доступны всегда:
+            size, capacity, load_factor - размер, емкость и коэффициент загрузки;
+            bucket_histogram - {длина цепочки: количество корзин};
+            max_chain - длина самой длинной цепочки;
+            mean_chain - средняя длина непустой цепочки;
+            rehash_pending - сколько корзин старого массива еще не перенесено.
+        Счетчики операций есть только при stats=True:
+            find_hits, find_misses - попадания и промахи `find`/`find_many`;
+            resize_count, resize_time - количество рехэширований и суммарное время (в секундах).
+        """
+        histogram = {}
+        for bucket in self.array:
+            length = len(bucket) if bucket else 0
+            histogram[length] = histogram.get(length, 0) + 1
+        non_empty = self._capacity - histogram.get(0, 0)
+        in_array = sum(length * count for length, count in histogram.items())
+        result = {
+            'size': self._size,
+            'capacity': self._capacity,
+            'load_factor': self._size / self._capacity,
+            'bucket_histogram': dict(sorted(histogram.items())),
+            'max_chain': max(histogram),
+            'mean_chain': in_array / non_empty if non_empty else 0.0,
+            'rehash_pending': 0 if self._old_array is None else len(self._old_array) - self._rehash_index,
+        }
+        if self._stats:
+            result.update(
+                find_hits=self._find_hits,
+                find_misses=self._find_misses,
+                resize_count=self._resize_count,
+                resize_time=self._resize_time,
+            )
+        return result
 
     def __str__(self):
         """
@@ -288,6 +644,116 @@ class HashTableOnLists:
         return str(self.array)
 
 
+class HashMapOnLists:
+    """
+    Хэш-таблица "ключ -> значение" (аналог dict) на методе цепочек.
+
+    В отличие от `HashTableOnLists`, каждая запись в корзине хранится как кортеж
+    (хэш, ключ, значение). Закэшированный хэш дает два преимущества:
+    - при поиске сначала сравниваются целые числа (хэши), и только при их
+      совпадении вызывается более дорогой `==` для ключей;
+    - при рехэшировании (`_resize`) индекс новой корзины считается по сохраненному
+      хэшу, без повторного вызова `hash()` и без проверки на дубликаты.
+    Это особенно заметно для ключей, которые дорого хэшировать (длинные строки, кортежи).
+    """
+
+    def __init__(self, capacity=10):
+        """
+        Args:
+            capacity (int): Начальная емкость (количество корзин). По умолчанию 10.
+        """
+        self._capacity = capacity
+        self._size = 0
+        self.array = [[] for _ in range(self._capacity)]
+
+    def _find_entry(self, key, h):
+        """
+        Ищет запись с ключом `key` (хэш `h`).
+
+        Returns:
+            tuple: (корзина, позиция записи в корзине); позиция равна -1, если ключа нет.
+        """
+        bucket = self.array[h % self._capacity]
+        for i, entry in enumerate(bucket):
+            # Сначала дешевое сравнение хэшей, потом сравнение ключей.
+            if entry[0] == h and (entry[1] is key or entry[1] == key):
+                return bucket, i
+        return bucket, -1
+
+    def __getitem__(self, key):
+        bucket, i = self._find_entry(key, hash(key))
+        if i < 0:
+            raise KeyError(key)
+        return bucket[i][2]
+
+    def get(self, key, default=None):
+        """Возвращает значение по ключу или `default`, если ключа нет."""
+        bucket, i = self._find_entry(key, hash(key))
+        if i < 0:
+            return default
+        return bucket[i][2]
+
+    def __setitem__(self, key, value):
+        h = hash(key)
+        bucket, i = self._find_entry(key, h)
+        if i >= 0:
+            # Ключ уже есть - обновляем значение, хэш остается прежним.
+            bucket[i] = (h, bucket[i][1], value)
+            return
+        bucket.append((h, key, value))
+        self._size += 1
+        if self._size > self._capacity * 0.75:
+            self._resize()
+
+    def __delitem__(self, key):
+        bucket, i = self._find_entry(key, hash(key))
+        if i < 0:
+            raise KeyError(key)
+        del bucket[i]
+        self._size -= 1
+
+    def pop(self, key, default=None):
+        """Удаляет ключ и возвращает его значение (или `default`, если ключа нет)."""
+        bucket, i = self._find_entry(key, hash(key))
+        if i < 0:
+            return default
+        self._size -= 1
+        return bucket.pop(i)[2]
+
+    def __contains__(self, key):
+        return self._find_entry(key, hash(key))[1] >= 0
+
+    def __len__(self):
+        return self._size
+
+    def __iter__(self):
+        for bucket in self.array:
+            for entry in bucket:
+                yield entry[1]
+
+    def items(self):
+        """Итерирует пары (ключ, значение)."""
+        for bucket in self.array:
+            for _, key, value in bucket:
+                yield key, value
+
+    def _resize(self):
+        """
+        Удваивает емкость и раскладывает записи по новым корзинам.
+        Индекс считается по закэшированному хэшу: `hash()` и `==` не вызываются.
+        """
+        old_array = self.array
+        self._capacity *= 2
+        capacity = self._capacity
+        self.array = array = [[] for _ in range(capacity)]
+        for bucket in old_array:
+            for entry in bucket:
+                array[entry[0] % capacity].append(entry)
+
+    def __str__(self):
+        return str(dict(self.items()))
+
+
 """
 
 **Ключевые моменты, на которые стоит обратить внимание при изучении:**
@@ -296,6 +762,281 @@ class HashTableOnLists:
 2.  **Коллизии**: Что происходит, если `_hash` выдает одинаковый индекс для разных ключей? (Ключи добавляются в один и тот же вложенный список - "цепочку"). Как `find`, `push`, `pop` работают с этими цепочками? (Они итерируют по списку в нужной корзине).
 3.  **Метод цепочек**: Это и есть использование списков (`self.array[index]`) для хранения элементов с одинаковым хэшем.
 4.  **Коэффициент загрузки (Load Factor)**: Зачем он нужен (`_size / _capacity`)? (Чтобы избежать слишком длинных цепочек, которые замедляют поиск/вставку/удаление). Как он используется в `push`? (Для запуска `_resize`).
-5.  **Рехэширование (`_resize`)**: Почему просто скопировать старый массив в новый, больший, нельзя? (Потому что изменилась `_capacity`, и остаток от деления `% self._capacity` будет другим, ключи должны попасть в *новые* корзины). Как элементы переносятся? (Каждый элемент из старой таблицы заново вставляется (`push`) в новую таблицу).
+5.  **Рехэширование (`_resize`)**: Почему просто скопировать старый массив в новый, больший, нельзя? (Потому что изменилась `_capacity`, и остаток от деления `% self._capacity` будет другим, ключи должны попасть в *новые* корзины). Как элементы переносятся? (Каждый элемент из старой таблицы кладется в свою корзину новой таблицы; проверять дубликаты заново не нужно).
 6.  **Амортизированная сложность**: Хотя `_resize` может быть долгой операцией (O(N), где N - количество элементов), она происходит редко. В среднем операции `push`, `find`, `pop` выполняются за O(1 + k), где k - средняя длина цепочки. При хорошем хэшировании и контроле коэффициента загрузки k близко к константе, и операции считаются амортизированно O(1).
-"""
\ No newline at end of file
+"""
+
+
+# Тесты
+import unittest
+
+class TestHashTableOnLists(unittest.TestCase):
+    def setUp(self):
+        self.table = HashTableOnLists()
+
+    def test_push_and_find(self):
+        self.table.push("apple")
+        self.table.push("banana")
+        self.assertEqual(self.table.find("apple"), "apple")
+        self.assertEqual(self.table.find("banana"), "banana")
+        self.assertIsNone(self.table.find("orange"))
+
+    def test_no_duplicates(self):
+        self.table.push("apple")
+        self.table.push("apple")  # вторая вставка не должна увеличить размер
+        self.assertEqual(self.table._size, 1)
+        self.assertEqual(self.table.find("apple"), "apple")
+
+    def test_pop_existing(self):
+        self.table.push("apple")
+        result = self.table.pop("apple")
+        self.assertEqual(result, "apple")
+        self.assertIsNone(self.table.find("apple"))
+        self.assertEqual(self.table._size, 0)
+
+    def test_pop_non_existing(self):
+        result = self.table.pop("nonexistent")
+        self.assertIsNone(result)
+
+    def test_resize(self):
+        for i in range(20):  # должно триггернуть resize
+            self.table.push(f"key{i}")
+        self.assertGreaterEqual(self.table._capacity, 20)
+        for i in range(20):
+            self.assertEqual(self.table.find(f"key{i}"), f"key{i}")
+
+    def test_table_structure_after_operations(self):
+        self.table.push("apple")
+        self.table.push("banana")
+        self.table.pop("apple")
+        structure = str(self.table)
+        self.assertIn("banana", structure)
+        self.assertNotIn("apple", structure)
+
+    def test_incremental_resize(self):
+        table = HashTableOnLists(incremental=True)
+        for i in range(1000):
+            table.push(i)
+            # во время переноса все ключи должны оставаться доступными
+            self.assertEqual(table.find(i // 2), i // 2)
+        self.assertEqual(table._size, 1000)
+        for i in range(1000):
+            self.assertEqual(table.find(i), i)
+        self.assertIsNone(table.find(1000))
+
+    def test_incremental_resize_in_progress(self):
+        table = HashTableOnLists(capacity=8, incremental=True, rehash_step=1)
+        for i in range(7):
+            table.push(i)
+        # перенос начался, но еще не закончен
+        self.assertIsNotNone(table._old_array)
+        table.push(3)  # дубликат из старого массива не добавляется
+        self.assertEqual(table._size, 7)
+        self.assertEqual(table.pop(5), 5)
+        self.assertIsNone(table.find(5))
+        self.assertEqual(table._size, 6)
+        table._finish_rehash()
+        self.assertIsNone(table._old_array)
+        self.assertEqual(sorted(k for b in table.array if b for k in b), [0, 1, 2, 3, 4, 6])
+
+    def test_shrink_on_pop(self):
+        for incremental in (False, True):
+            table = HashTableOnLists(incremental=incremental)
+            for i in range(1000):
+                table.push(i)
+            grown = table._capacity
+            for i in range(990):
+                table.pop(i)
+            self.assertLess(table._capacity, grown // 8)
+            self.assertGreaterEqual(table._capacity, 10)
+            for i in range(990, 1000):
+                self.assertEqual(table.find(i), i)
+
+    def test_reserve_and_compact(self):
+        self.table.reserve(1000)
+        capacity = self.table._capacity
+        self.assertGreaterEqual(capacity * 0.75, 1000)
+        for i in range(1000):
+            self.table.push(i)
+        # после reserve массовая загрузка не вызывает рехэширования
+        self.assertEqual(self.table._capacity, capacity)
+        for i in range(995):
+            self.table.pop(i)
+        # емкость из reserve не сжимается сама по себе...
+        self.assertEqual(self.table._capacity, capacity)
+        # ...пока не вызван compact
+        self.table.compact()
+        self.assertEqual(self.table._capacity, 10)
+        self.assertEqual(sorted(k for b in self.table.array for k in b), [995, 996, 997, 998, 999])
+
+    def test_push_many(self):
+        self.table.push("a")
+        added = self.table.push_many(["a", "b", "c", "b"] + list(range(1000)))
+        self.assertEqual(added, 1002)
+        self.assertEqual(self.table._size, 1003)
+        self.assertLessEqual(self.table._size, self.table._capacity * 0.75)
+        self.assertEqual(self.table.find("c"), "c")
+        self.assertEqual(self.table.find(999), 999)
+        # пакет из уже существующих ключей не раздувает таблицу
+        capacity = self.table._capacity
+        self.assertEqual(self.table.push_many(list(range(1000)) * 3), 0)
+        self.assertEqual(self.table._capacity, capacity)
+
+    def test_batches_keep_rehash_incremental(self):
+        table = HashTableOnLists(incremental=True, rehash_step=1)
+        for i in range(1000):
+            table.push(i)
+        table.push_many(range(1000, 2000))
+        # пакетные операции переносят корзины порциями, а не весь старый массив за раз
+        self.assertIsNotNone(table._old_array)
+        index = table._rehash_index
+        self.assertEqual(table.find_many([0, 1999, 2000, 3]), [True, True, False, True])
+        self.assertIsNotNone(table._old_array)
+        self.assertLessEqual(table._rehash_index - index, 4 * table._current_step)
+        self.assertEqual(table.pop_many([0, 1999, 2000]), [True, True, False])
+        self.assertEqual(table.push_many([0, 1, 2001]), 2)
+        self.assertIsNotNone(table._old_array)
+        self.assertEqual(table._size, 2000)
+        self.assertEqual(table.find_many(range(2002)), [True] * 1999 + [False, False, True])
+
+    def test_find_many_and_pop_many(self):
+        for incremental in (False, True):
+            table = HashTableOnLists(incremental=incremental)
+            for i in range(1000):
+                table.push(i)
+            self.assertEqual(table.find_many([0, 500, 1000, -1]), [True, True, False, False])
+            self.assertEqual(table.pop_many([0, 0, 1000]), [True, False, False])
+            table.pop_many(range(1, 995))
+            self.assertEqual(table._size, 5)
+            # таблица сжалась так же, как после последовательных pop
+            self.assertLess(table._capacity, 100)
+            self.assertEqual(table.find_many(range(995, 1000)), [True] * 5)
+
+    def test_stats(self):
+        table = HashTableOnLists(stats=True)
+        for i in range(100):
+            table.push(i)
+        table.find(1)
+        table.find(-1)
+        table.find_many([2, 3, -2])
+        stats = table.stats()
+        self.assertEqual(stats['size'], 100)
+        self.assertEqual(stats['find_hits'], 3)
+        self.assertEqual(stats['find_misses'], 2)
+        self.assertGreaterEqual(stats['resize_count'], 3)
+        self.assertGreater(stats['resize_time'], 0)
+        self.assertEqual(sum(stats['bucket_histogram'].values()), stats['capacity'])
+        self.assertEqual(sum(k * v for k, v in stats['bucket_histogram'].items()), 100)
+        self.assertGreaterEqual(stats['max_chain'], stats['mean_chain'])
+
+    def test_bloom_filter(self):
+        for incremental in (False, True):
+            table = HashTableOnLists(incremental=incremental, bloom=True, stats=True)
+            for i in range(2000):
+                table.push(i)
+                self.assertEqual(table.find(i // 2), i // 2)
+            for i in range(0, 2000, 2):
+                table.pop(i)
+            for i in range(2000):
+                self.assertEqual(table.find(i), None if i % 2 == 0 else i)
+            table.push_many(range(2000, 3000))
+            self.assertEqual(table.find_many([2999, 3000, 1, 2]), [True, False, True, False])
+            table.pop_many(range(1, 3000))
+            self.assertEqual(table._size, 0)
+            self.assertIsNone(table.find(2999))
+
+    def test_bloom_filter_answers_misses(self):
+        table = HashTableOnLists(bloom=True, bloom_fp_rate=0.01)
+        table.push_many(range(1000))
+        # промахи не доходят до корзин: проверяем по фильтру напрямую
+        passed = sum(table._bloom_might_contain(i) for i in range(1000, 11000))
+        self.assertLess(passed, 300)
+
+    def test_stats_disabled(self):
+        self.table.push("apple")
+        self.table.find("apple")
+        stats = self.table.stats()
+        self.assertEqual(stats['size'], 1)
+        self.assertNotIn('find_hits', stats)
+        self.assertEqual(self.table._find_hits, 0)
+
+
+    def test_incremental_shrink_keeps_operations_bounded(self):
+        table = HashTableOnLists(incremental=True, rehash_step=4)
+        for i in range(20000):
+            table.push(i)
+        table._finish_rehash()
+
+        # pop не должен доводить перенос до конца за одну операцию:
+        # к следующему _resize старый массив уже перенесен
+        def finish_rehash():
+            self.assertIsNone(table._old_array)
+
+        table._finish_rehash = finish_rehash
+        for i in range(20000):
+            self.assertEqual(table.pop(i), i)
+            # шаг не растет с размером таблицы (на крошечных таблицах сказывается округление)
+            if table._capacity >= 1000:
+                self.assertLessEqual(table._current_step, 32)
+        self.assertEqual(table._size, 0)
+        self.assertLess(table._capacity, 100)
+
+
+class TestHashMapOnLists(unittest.TestCase):
+    def setUp(self):
+        self.map = HashMapOnLists()
+
+    def test_set_and_get(self):
+        self.map["apple"] = 1
+        self.map["banana"] = 2
+        self.map["apple"] = 3  # обновление значения не меняет размер
+        self.assertEqual(self.map["apple"], 3)
+        self.assertEqual(self.map.get("banana"), 2)
+        self.assertIsNone(self.map.get("orange"))
+        self.assertEqual(len(self.map), 2)
+        with self.assertRaises(KeyError):
+            self.map["orange"]
+
+    def test_contains_and_delete(self):
+        self.map[(1, 2)] = "tuple"
+        self.assertIn((1, 2), self.map)
+        del self.map[(1, 2)]
+        self.assertNotIn((1, 2), self.map)
+        self.assertEqual(self.map.pop((1, 2), "missing"), "missing")
+        with self.assertRaises(KeyError):
+            del self.map[(1, 2)]
+
+    def test_resize_does_not_rehash_keys(self):
+        class CountingKey:
+            calls = 0
+
+            def __init__(self, value):
+                self.value = value
+
+            def __hash__(self):
+                CountingKey.calls += 1
+                return hash(self.value)
+
+            def __eq__(self, other):
+                return self.value == other.value
+
+        keys = [CountingKey(i) for i in range(100)]
+        for i, key in enumerate(keys):
+            self.map[key] = i
+        # ровно один вызов hash() на каждую вставку, несмотря на несколько _resize
+        self.assertEqual(CountingKey.calls, 100)
+        self.assertGreaterEqual(self.map._capacity, 100)
+        self.assertEqual(sorted(v for _, v in self.map.items()), list(range(100)))
+        self.assertEqual(self.map[keys[42]], 42)
+
+if __name__ == "__main__":
+    unittest.main()
+
+
+"""
+Ran 21 tests in 0.296s
+
+OK
+
+Process finished with exit code 0
+"""
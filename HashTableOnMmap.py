@@ -0,0 +1,431 @@
+"""
+Персистентный хэш-индекс в файле, отображенном в память (`mmap`).
+
+Таблица с открытой адресацией (линейное пробирование, надгробия при удалении), у которой все
+данные лежат прямо в файле записями фиксированного размера:
+
+    заголовок (64 байта): magic, capacity, size, used (живые + надгробия), key_size, generation
+    запись i:             state (1 байт) | длина ключа (2 байта) | хэш (8 байт) | ключ (key_size байт)
+
+Что это дает по сравнению с `HashTableOnLists`:
+- открытие существующего файла - O(1): читается только заголовок, ничего не десериализуется;
+- данные переживают перезапуск процесса;
+- несколько процессов (например, воркеры после fork) могут открыть файл только на чтение и
+  использовать одни и те же страницы из page cache без собственных копий.
+
+Увеличение таблицы не переписывает живой файл: новая таблица строится во временном файле
+рядом и атомарно подменяет старую (`os.replace`). Сбой посреди перестроения оставляет
+старый индекс целым. После подмены писатель увеличивает `generation` в заголовке старого
+файла: читатель, который держит старый файл открытым, видит это при следующем `find`
+и переоткрывает файл по пути.
+
+Ключи - `bytes` или `str` (кодируется в UTF-8) длиной не больше `key_size` байт;
+другие типы (например, `int`) отклоняются с `TypeError`.
+Хэш - стабильный (blake2b), а не встроенный `hash()`, который для строк различается
+между процессами.
+
+API совпадает с `HashTableOnLists`: `find`, `push`, `pop`.
+"""
+
+import hashlib
+import mmap
+import os
+import struct
+
+_MAGIC = b'HTMMAP01'
+# magic, capacity, size, used, key_size, generation
+# (в файлах без поля generation на его месте нули - поколение 0)
+_HEADER = struct.Struct('<8sQQQQQ')
+_HEADER_SIZE = 64
+_GENERATION = struct.Struct('<Q')
+_GENERATION_OFFSET = 40
+# state, длина ключа, хэш
+_RECORD = struct.Struct('<BxHxxxxQ')
+
+_EMPTY = 0
+_FULL = 1
+_DELETED = 2
+
+
+class HashTableOnMmap:
+    # Максимальная загрузка с учетом надгробий.
+    _MAX_LOAD = 0.7
+
+    # конструктор: открывает существующий файл или создает новый
+    def __init__(self, path, capacity=1024, key_size=32, readonly=False):
+        self._path = path
+        self._readonly = readonly
+        if os.path.exists(path):
+            self._open_existing()
+        else:
+            if readonly:
+                raise FileNotFoundError(path)
+            if not 0 < key_size < 1 << 16:
+                raise ValueError('key_size must be in range 1..65535')
+            self._capacity = 8
+            while self._capacity < capacity:
+                self._capacity *= 2
+            self._size = self._used = 0
+            self._key_size = key_size
+            self._generation = 0
+            self._file = open(path, 'w+b')
+            self._file.truncate(self._file_size(self._capacity))
+            self._map()
+            self._write_header()
+        self._record_size = _RECORD.size + self._key_size
+
+    # открывает существующий файл и читает заголовок
+    def _open_existing(self):
+        self._file = open(self._path, 'rb' if self._readonly else 'r+b')
+        self._map()
+        magic, capacity, size, used, key_size, generation = _HEADER.unpack_from(self._mm, 0)
+        if magic != _MAGIC:
+            self.close()
+            raise ValueError(f'{self._path} is not a hash table file')
+        self._capacity, self._size, self._used, self._key_size = capacity, size, used, key_size
+        self._generation = generation
+        self._record_size = _RECORD.size + self._key_size
+
+    # Для читателя: если писатель подменил файл (поколение в заголовке изменилось),
+    # переоткрываем его по пути; иначе только обновляем size из заголовка.
+    def _refresh(self):
+        if not self._readonly:
+            return
+        if _GENERATION.unpack_from(self._mm, _GENERATION_OFFSET)[0] != self._generation:
+            self._mm.close()
+            self._file.close()
+            self._open_existing()
+        else:
+            self._size = _HEADER.unpack_from(self._mm, 0)[2]
+
+    # отображает файл в память
+    def _map(self):
+        access = mmap.ACCESS_READ if self._readonly else mmap.ACCESS_WRITE
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=access)
+
+    def _file_size(self, capacity):
+        return _HEADER_SIZE + capacity * (_RECORD.size + self._key_size)
+
+    def _write_header(self):
+        _HEADER.pack_into(self._mm, 0, _MAGIC, self._capacity, self._size, self._used, self._key_size,
+                          self._generation)
+
+    # приводит ключ к bytes и проверяет тип и длину
+    # (bytes(3) - это три нулевых байта, поэтому int и прочие типы не принимаются)
+    def _encode(self, key):
+        if isinstance(key, str):
+            data = key.encode()
+        elif isinstance(key, (bytes, bytearray, memoryview)):
+            data = bytes(key)
+        else:
+            raise TypeError(f'key must be str or bytes, not {type(key).__name__}')
+        if len(data) > self._key_size:
+            raise ValueError(f'key is longer than {self._key_size} bytes')
+        return data
+
+    # стабильный 64-битный хэш ключа (одинаковый во всех процессах)
+    @staticmethod
+    def _hash(data):
+        return int.from_bytes(hashlib.blake2b(data, digest_size=8).digest(), 'little')
+
+    # ищет запись с ключом; возвращает (индекс записи или -1, первая свободная ячейка или -1)
+    def _lookup(self, data, h):
+        mm = self._mm
+        record_size = self._record_size
+        mask = self._capacity - 1
+        index = h & mask
+        free = -1
+        while True:
+            offset = _HEADER_SIZE + index * record_size
+            state, length, stored = _RECORD.unpack_from(mm, offset)
+            if state == _EMPTY:
+                return -1, index if free < 0 else free
+            if state == _DELETED:
+                if free < 0:
+                    free = index
+            elif stored == h and length == len(data):
+                start = offset + _RECORD.size
+                if mm[start:start + length] == data:
+                    return index, free
+            index = (index + 1) & mask
+
+    # находит и возвращает элемент по ключу
+    def find(self, key):
+        self._refresh()
+        data = self._encode(key)
+        index, _ = self._lookup(data, self._hash(data))
+        return key if index >= 0 else None
+
+    # вставляет элемент
+    def push(self, key):
+        self._check_writable()
+        data = self._encode(key)
+        h = self._hash(data)
+        index, free = self._lookup(data, h)
+        if index >= 0:
+            print(f'{key} есть в таблице.')
+            return
+        offset = _HEADER_SIZE + free * self._record_size
+        if self._mm[offset] == _EMPTY:
+            self._used += 1
+        self._write_record(free, h, data)
+        self._size += 1
+        # заголовок пишется до перестроения: если оно не удастся, запись уже учтена в файле
+        self._write_header()
+        if self._used > self._capacity * self._MAX_LOAD:
+            self._resize()
+
+    def _write_record(self, index, h, data, mm=None):
+        mm = self._mm if mm is None else mm
+        offset = _HEADER_SIZE + index * self._record_size
+        _RECORD.pack_into(mm, offset, _FULL, len(data), h)
+        start = offset + _RECORD.size
+        mm[start:start + len(data)] = data
+
+    # удаляет и возвращает элемент (запись помечается надгробием)
+    def pop(self, key):
+        self._check_writable()
+        data = self._encode(key)
+        index, _ = self._lookup(data, self._hash(data))
+        if index < 0:
+            return None
+        self._mm[_HEADER_SIZE + index * self._record_size] = _DELETED
+        self._size -= 1
+        self._write_header()
+        return key
+
+    def _check_writable(self):
+        if self._readonly:
+            raise PermissionError('table is opened read-only')
+
+    # Приватный вспомогательный метод для перестроения файла.
+    # Живые записи (хэш + ключ) раскладываются заново по сохраненным хэшам (blake2b повторно
+    # не считается) в новый файл - больше старого или того же размера, если место занимали
+    # в основном надгробия. Новый файл пишется рядом и атомарно подменяет старый, поэтому
+    # сбой посреди перестроения не портит индекс. Затем в заголовке старого файла
+    # увеличивается поколение, чтобы читатели, открывшие его раньше, переоткрыли файл.
+    # Новый файл строится в локальных переменных: пока подмена не удалась, таблица
+    # продолжает писать в старый файл, а недостроенный временный файл удаляется.
+    def _resize(self):
+        old_mm, old_file = self._mm, self._file
+        records = []
+        for index in range(self._capacity):
+            offset = _HEADER_SIZE + index * self._record_size
+            state, length, h = _RECORD.unpack_from(old_mm, offset)
+            if state == _FULL:
+                start = offset + _RECORD.size
+                records.append((h, old_mm[start:start + length]))
+        capacity = self._capacity
+        if self._size * 2 > capacity * self._MAX_LOAD:
+            capacity *= 2
+        tmp_path = self._path + '.tmp'
+        new_file = open(tmp_path, 'w+b')
+        new_mm = None
+        try:
+            new_file.truncate(self._file_size(capacity))
+            new_mm = mmap.mmap(new_file.fileno(), 0, access=mmap.ACCESS_WRITE)
+            mask = capacity - 1
+            for h, data in records:
+                index = h & mask
+                while new_mm[_HEADER_SIZE + index * self._record_size] != _EMPTY:
+                    index = (index + 1) & mask
+                self._write_record(index, h, data, new_mm)
+            # в новом файле надгробий нет: used == size
+            _HEADER.pack_into(new_mm, 0, _MAGIC, capacity, self._size, self._size, self._key_size,
+                              self._generation + 1)
+            # новый файл должен быть на диске до подмены
+            new_mm.flush()
+            os.fsync(new_file.fileno())
+            os.replace(tmp_path, self._path)
+        except BaseException:
+            if new_mm is not None:
+                new_mm.close()
+            new_file.close()
+            os.remove(tmp_path)
+            raise
+        self._mm, self._file, self._capacity = new_mm, new_file, capacity
+        self._used = self._size
+        self._generation += 1
+        # старый файл больше не используется писателем: помечаем его устаревшим
+        _GENERATION.pack_into(old_mm, _GENERATION_OFFSET, self._generation)
+        old_mm.flush()
+        old_mm.close()
+        old_file.close()
+
+    # сбрасывает изменения на диск
+    def flush(self):
+        if not self._readonly:
+            self._mm.flush()
+
+    def close(self):
+        if not self._mm.closed:
+            self.flush()
+            self._mm.close()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        self._refresh()
+        return self._size
+
+    def __contains__(self, key):
+        return self.find(key) is not None
+
+    # Строковое представление объекта (живые ключи в виде bytes)
+    def __str__(self):
+        self._refresh()
+        keys = []
+        for index in range(self._capacity):
+            offset = _HEADER_SIZE + index * self._record_size
+            state, length, _ = _RECORD.unpack_from(self._mm, offset)
+            if state == _FULL:
+                start = offset + _RECORD.size
+                keys.append(self._mm[start:start + length])
+        return str(keys)
+
+
+# Тесты
+import shutil
+import tempfile
+import unittest
+
+
+class TestHashTableOnMmap(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'index.bin')
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_push_find_pop(self):
+        with HashTableOnMmap(self.path) as table:
+            table.push("apple")
+            table.push(b"banana")
+            table.push("apple")
+            self.assertEqual(len(table), 2)
+            self.assertEqual(table.find("apple"), "apple")
+            self.assertEqual(table.find("banana"), "banana")
+            self.assertIsNone(table.find("orange"))
+            self.assertEqual(table.pop("apple"), "apple")
+            self.assertIsNone(table.pop("apple"))
+            self.assertIsNone(table.find("apple"))
+
+    def test_persistence_and_resize(self):
+        with HashTableOnMmap(self.path, capacity=8, key_size=16) as table:
+            for i in range(1000):
+                table.push(f"key{i}")
+            for i in range(0, 1000, 2):
+                table.pop(f"key{i}")
+            self.assertGreaterEqual(table._capacity, 1024)
+        # повторное открытие читает только заголовок
+        with HashTableOnMmap(self.path) as table:
+            self.assertEqual(len(table), 500)
+            self.assertEqual(table._key_size, 16)
+            for i in range(1000):
+                self.assertEqual(f"key{i}" in table, i % 2 == 1)
+
+    def test_readonly(self):
+        with HashTableOnMmap(self.path) as table:
+            table.push("apple")
+        with HashTableOnMmap(self.path, readonly=True) as table:
+            self.assertEqual(table.find("apple"), "apple")
+            with self.assertRaises(PermissionError):
+                table.push("banana")
+
+    def test_reader_sees_resize(self):
+        with HashTableOnMmap(self.path, capacity=8) as writer:
+            writer.push("k0")
+            reader = HashTableOnMmap(self.path, readonly=True)
+            self.assertEqual(reader.find("k0"), "k0")
+            for i in range(1, 200):
+                writer.push(f"k{i}")
+            self.assertGreaterEqual(writer._capacity, 256)
+            # читатель держал старый файл, но обнаружил подмену по поколению
+            self.assertEqual(reader.find("k0"), "k0")
+            self.assertEqual(reader.find("k199"), "k199")
+            self.assertEqual(len(reader), 200)
+            self.assertEqual(reader._capacity, writer._capacity)
+            reader.close()
+        self.assertFalse(os.path.exists(self.path + '.tmp'))
+
+    def test_failed_resize_keeps_index(self):
+        table = HashTableOnMmap(self.path, capacity=8)
+        for i in range(5):
+            table.push(f"k{i}")
+        # имитируем сбой в момент подмены файла
+        original_replace = os.replace
+
+        def crash(*args):
+            raise OSError('crash')
+
+        os.replace = crash
+        try:
+            with self.assertRaises(OSError):
+                for i in range(5, 10):
+                    table.push(f"k{i}")
+        finally:
+            os.replace = original_replace
+        # файл по старому пути не тронут перестроением
+        with HashTableOnMmap(self.path, readonly=True) as reopened:
+            self.assertEqual(reopened._capacity, 8)
+            for i in range(5):
+                self.assertEqual(reopened.find(f"k{i}"), f"k{i}")
+
+    def test_failed_resize_keeps_writing_to_index(self):
+        table = HashTableOnMmap(self.path, capacity=8)
+        for i in range(5):
+            table.push(f"k{i}")
+
+        def crash(*args):
+            raise OSError('crash')
+
+        original_replace = os.replace
+        os.replace = crash
+        try:
+            with self.assertRaises(OSError):
+                table.push("k5")
+        finally:
+            os.replace = original_replace
+        # недостроенный файл удален, писатель остался на старом файле
+        self.assertFalse(os.path.exists(self.path + '.tmp'))
+        self.assertEqual(table._capacity, 8)
+        table.push("after")
+        table.close()
+        with HashTableOnMmap(self.path, readonly=True) as reopened:
+            self.assertEqual(len(reopened), 7)
+            for key in [f"k{i}" for i in range(6)] + ["after"]:
+                self.assertEqual(reopened.find(key), key)
+
+    def test_key_types(self):
+        with HashTableOnMmap(self.path) as table:
+            table.push(bytearray(b"abc"))
+            self.assertEqual(table.find(memoryview(b"abc")), memoryview(b"abc"))
+            for key in (3, 2.5, None):
+                with self.assertRaises(TypeError):
+                    table.push(key)
+                with self.assertRaises(TypeError):
+                    table.find(key)
+            # bytes(3) == b'\0\0\0' - ключ из нулевых байт не путается с числом
+            table.push(b"\0\0\0")
+            self.assertEqual(len(table), 2)
+
+    def test_key_too_long(self):
+        with HashTableOnMmap(self.path, key_size=4) as table:
+            with self.assertRaises(ValueError):
+                table.push("too long")
+
+    def test_not_a_table(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'\0' * 128)
+        with self.assertRaises(ValueError):
+            HashTableOnMmap(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
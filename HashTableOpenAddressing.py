@@ -0,0 +1,254 @@
+"""
+Хэш-таблица с открытой адресацией (Open addressing).
+
+В отличие от `HashTableOnLists`, здесь нет списков-корзин: все данные лежат в трёх
+плоских параллельных массивах одинаковой длины:
+- `_hashes` - `array('q')` с закэшированными значениями `hash(key)` (-1 означает пустую ячейку,
+  CPython никогда не возвращает -1 из `hash()`);
+- `_keys` - ключи (или маркер-надгробие `_DELETED` для удалённых элементов);
+- `_values` - значения, связанные с ключами.
+
+При коллизии ищется следующая свободная ячейка (пробирование):
+- линейное: i, i + 1, i + 2, ...
+- квадратичное (треугольные числа): i, i + 1, i + 3, i + 6, ... - при ёмкости, равной степени
+  двойки, обходит все ячейки таблицы.
+
+Удаление (`pop`) не может просто очистить ячейку - это разорвёт цепочку пробирования для
+других ключей, поэтому на её место ставится надгробие. Надгробия переиспользуются при вставке
+и вычищаются при перестроении таблицы.
+
+API совпадает с `HashTableOnLists`: `find`, `push`, `pop`.
+
+Сложность (в среднем): find / push / pop - O(1), память - O(capacity) без отдельного объекта
+на каждую корзину.
+"""
+
+from array import array
+
+# Маркер удалённого элемента (надгробие).
+_DELETED = object()
+# Значение в массиве хэшей для пустой ячейки.
+_EMPTY = -1
+
+
+class HashTableOpenAddressing:
+    # Максимальный коэффициент загрузки (с учётом надгробий), после которого таблица перестраивается.
+    _MAX_LOAD = 0.7
+
+    # конструктор класса
+    def __init__(self, capacity=8, probing='linear'):
+        if probing not in ('linear', 'quadratic'):
+            raise ValueError(f'Unknown probing: {probing}')
+        self._probing = probing
+        # ёмкость всегда степень двойки, чтобы вместо % использовать битовую маску
+        self._capacity = 8
+        while self._capacity < capacity:
+            self._capacity *= 2
+        self._size = 0
+        self._deleted = 0  # количество надгробий
+        self._init_arrays(self._capacity)
+
+    # создаёт пустые параллельные массивы заданной ёмкости
+    def _init_arrays(self, capacity):
+        self._hashes = array('q', [_EMPTY]) * capacity
+        self._keys = [None] * capacity
+        self._values = [None] * capacity
+
+    # ищет ячейку с ключом key, возвращает её индекс или -1
+    def _lookup(self, key, h):
+        hashes = self._hashes
+        keys = self._keys
+        mask = self._capacity - 1
+        index = h & mask
+        step = 1
+        quadratic = self._probing == 'quadratic'
+        while True:
+            stored = hashes[index]
+            if stored == _EMPTY and keys[index] is not _DELETED:
+                return -1
+            # сначала сравниваем закэшированные хэши, и только потом сами ключи
+            if stored == h:
+                k = keys[index]
+                if k is key or k == key:
+                    return index
+            if quadratic:
+                index = (index + step) & mask
+                step += 1
+            else:
+                index = (index + 1) & mask
+
+    # находит и возвращает элемент по ключу
+    def find(self, key):
+        index = self._lookup(key, hash(key))
+        if index < 0:
+            return None
+        return self._keys[index]
+
+    # возвращает значение по ключу или default
+    def get(self, key, default=None):
+        index = self._lookup(key, hash(key))
+        if index < 0:
+            return default
+        return self._values[index]
+
+    # вставляет элемент
+    def push(self, key, value=None):
+        h = hash(key)
+        hashes = self._hashes
+        keys = self._keys
+        mask = self._capacity - 1
+        index = h & mask
+        step = 1
+        quadratic = self._probing == 'quadratic'
+        free = -1  # первое встреченное надгробие - туда можно вставить ключ
+        while True:
+            stored = hashes[index]
+            if stored == _EMPTY:
+                if keys[index] is not _DELETED:
+                    break
+                if free < 0:
+                    free = index
+            elif stored == h:
+                k = keys[index]
+                if k is key or k == key:
+                    print(f'{key} есть в таблице.')
+                    return
+            if quadratic:
+                index = (index + step) & mask
+                step += 1
+            else:
+                index = (index + 1) & mask
+        if free >= 0:
+            index = free
+            self._deleted -= 1
+        hashes[index] = h
+        keys[index] = key
+        self._values[index] = value
+        self._size += 1
+        if self._size + self._deleted > self._capacity * self._MAX_LOAD:
+            self._resize()
+
+    # удаляет и возвращает элемент
+    def pop(self, key):
+        index = self._lookup(key, hash(key))
+        if index < 0:
+            return None
+        k = self._keys[index]
+        # ставим надгробие, чтобы не разорвать цепочку пробирования
+        self._hashes[index] = _EMPTY
+        self._keys[index] = _DELETED
+        self._values[index] = None
+        self._size -= 1
+        self._deleted += 1
+        return k
+
+    # Приватный вспомогательный метод для перестроения таблицы.
+    # Ёмкость удваивается только если живых элементов действительно много,
+    # иначе таблица перестраивается в том же размере - просто вычищаются надгробия.
+    # Хэши берутся из `_hashes`, `hash()` повторно не вызывается.
+    def _resize(self):
+        old_hashes, old_keys, old_values = self._hashes, self._keys, self._values
+        if self._size * 2 > self._capacity * self._MAX_LOAD:
+            self._capacity *= 2
+        self._init_arrays(self._capacity)
+        self._deleted = 0
+        hashes, keys, values = self._hashes, self._keys, self._values
+        mask = self._capacity - 1
+        quadratic = self._probing == 'quadratic'
+        for i, h in enumerate(old_hashes):
+            if h == _EMPTY:
+                continue
+            index = h & mask
+            step = 1
+            while hashes[index] != _EMPTY:
+                if quadratic:
+                    index = (index + step) & mask
+                    step += 1
+                else:
+                    index = (index + 1) & mask
+            hashes[index] = h
+            keys[index] = old_keys[i]
+            values[index] = old_values[i]
+
+    def __len__(self):
+        return self._size
+
+    def __contains__(self, key):
+        return self._lookup(key, hash(key)) >= 0
+
+    # Строковое представление объекта (только живые ключи)
+    def __str__(self):
+        return str([k for h, k in zip(self._hashes, self._keys) if h != _EMPTY])
+
+
+# Тесты
+import unittest
+
+
+class TestHashTableOpenAddressing(unittest.TestCase):
+    def setUp(self):
+        self.tables = [HashTableOpenAddressing(), HashTableOpenAddressing(probing='quadratic')]
+
+    def test_push_and_find(self):
+        for table in self.tables:
+            table.push("apple")
+            table.push("banana")
+            self.assertEqual(table.find("apple"), "apple")
+            self.assertEqual(table.find("banana"), "banana")
+            self.assertIsNone(table.find("orange"))
+
+    def test_no_duplicates(self):
+        for table in self.tables:
+            table.push("apple")
+            table.push("apple")
+            self.assertEqual(len(table), 1)
+
+    def test_pop_and_tombstones(self):
+        for table in self.tables:
+            # ключи 0, 8, 16 попадают в одну ячейку и образуют цепочку пробирования
+            for key in (0, 8, 16):
+                table.push(key)
+            self.assertEqual(table.pop(8), 8)
+            self.assertIsNone(table.pop(8))
+            # после удаления середины цепочки хвост всё ещё находится
+            self.assertEqual(table.find(16), 16)
+            self.assertIsNone(table.find(8))
+            # надгробие переиспользуется
+            table.push(24)
+            self.assertEqual(table._deleted, 0)
+            self.assertEqual(len(table), 3)
+
+    def test_values(self):
+        for table in self.tables:
+            table.push("a", 1)
+            self.assertEqual(table.get("a"), 1)
+            self.assertEqual(table.get("b", 42), 42)
+
+    def test_resize(self):
+        for table in self.tables:
+            for i in range(1000):
+                table.push(f"key{i}")
+            self.assertGreaterEqual(table._capacity, 1000)
+            for i in range(1000):
+                self.assertEqual(table.find(f"key{i}"), f"key{i}")
+            for i in range(0, 1000, 2):
+                table.pop(f"key{i}")
+            self.assertEqual(len(table), 500)
+            for i in range(1000):
+                self.assertEqual(f"key{i}" in table, i % 2 == 1)
+
+    def test_churn_does_not_fill_with_tombstones(self):
+        table = HashTableOpenAddressing()
+        for i in range(10000):
+            table.push(i)
+            table.pop(i)
+        self.assertEqual(len(table), 0)
+        self.assertLessEqual(table._capacity, 16)
+
+    def test_unknown_probing(self):
+        with self.assertRaises(ValueError):
+            HashTableOpenAddressing(probing='cubic')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,205 @@
+"""
+Хэш-таблица Robin Hood (открытая адресация с линейным пробированием).
+
+Идея "Робин Гуда": при вставке каждый элемент помнит, на сколько ячеек он ушел от своей
+"домашней" ячейки (дистанция пробирования, DIB). Если вставляемый элемент ушел дальше, чем
+элемент, занимающий текущую ячейку, они меняются местами - "богатый" (близкий к дому)
+уступает место "бедному". В итоге дистанции выравниваются, и:
+- поиск можно прекратить, как только встретилась ячейка с дистанцией меньше текущей;
+- таблица хранит `_max_dist` - максимальную дистанцию, это жесткая граница длины поиска.
+
+Удаление - обратным сдвигом (backward-shift deletion): элементы после удаленного сдвигаются
+на одну ячейку назад, пока не встретится пустая ячейка или элемент в своей домашней ячейке.
+Надгробия не нужны.
+
+Домашняя ячейка считается мультипликативным (фибоначчиевым) хэшированием - старшие биты
+`hash(key) * A`. Это перемешивает биты, поэтому ключи вида `i * 1024` не собираются
+в одну ячейку, как было бы с `hash(key) % capacity` при ёмкости - степени двойки.
+
+API совпадает с `HashTableOnLists`: `find`, `push`, `pop`.
+"""
+
+from array import array
+
+# Константа Кнута для мультипликативного хэширования (2^64 / золотое сечение).
+_GOLDEN = 0x9E3779B97F4A7C15
+_MASK64 = (1 << 64) - 1
+# Значение в массиве хэшей для пустой ячейки (CPython никогда не возвращает -1 из hash()).
+_EMPTY = -1
+
+
+class HashTableRobinHood:
+    # Максимальный коэффициент загрузки. Robin Hood держит короткие цепочки даже при высокой загрузке.
+    _MAX_LOAD = 0.85
+
+    # конструктор класса
+    def __init__(self, capacity=8):
+        self._bits = 3
+        while (1 << self._bits) < capacity:
+            self._bits += 1
+        self._capacity = 1 << self._bits
+        self._size = 0
+        self._max_dist = 0  # максимальная дистанция пробирования среди всех элементов
+        self._hashes = array('q', [_EMPTY]) * self._capacity
+        self._keys = [None] * self._capacity
+
+    # домашняя ячейка для хэша h (старшие биты произведения)
+    def _home(self, h):
+        return ((h * _GOLDEN) & _MASK64) >> (64 - self._bits)
+
+    # ищет ячейку с ключом, возвращает её индекс или -1
+    def _lookup(self, key, h):
+        hashes = self._hashes
+        mask = self._capacity - 1
+        index = self._home(h)
+        # дальше _max_dist ни один элемент не уходил - это граница поиска
+        for dist in range(self._max_dist + 1):
+            stored = hashes[index]
+            if stored == _EMPTY:
+                return -1
+            if stored == h:
+                k = self._keys[index]
+                if k is key or k == key:
+                    return index
+            # у элемента в ячейке дистанция меньше нашей - наш ключ сюда бы не ушел
+            if ((index - self._home(stored)) & mask) < dist:
+                return -1
+            index = (index + 1) & mask
+        return -1
+
+    # находит и возвращает элемент по ключу
+    def find(self, key):
+        index = self._lookup(key, hash(key))
+        return None if index < 0 else self._keys[index]
+
+    # вставляет элемент
+    def push(self, key):
+        h = hash(key)
+        if self._lookup(key, h) >= 0:
+            print(f'{key} есть в таблице.')
+            return
+        if self._size + 1 > self._capacity * self._MAX_LOAD:
+            self._resize()
+        self._insert(h, key)
+        self._size += 1
+
+    # вставка без проверки дубликатов и загрузки (используется в push и _resize)
+    def _insert(self, h, key):
+        hashes, keys = self._hashes, self._keys
+        mask = self._capacity - 1
+        index = self._home(h)
+        dist = 0
+        while True:
+            stored = hashes[index]
+            if stored == _EMPTY:
+                hashes[index] = h
+                keys[index] = key
+                if dist > self._max_dist:
+                    self._max_dist = dist
+                return
+            stored_dist = (index - self._home(stored)) & mask
+            if stored_dist < dist:
+                # "богатый" элемент уступает место, дальше вставляем его
+                hashes[index], h = h, stored
+                keys[index], key = key, keys[index]
+                if dist > self._max_dist:
+                    self._max_dist = dist
+                dist = stored_dist
+            index = (index + 1) & mask
+            dist += 1
+
+    # удаляет и возвращает элемент
+    def pop(self, key):
+        index = self._lookup(key, hash(key))
+        if index < 0:
+            return None
+        hashes, keys = self._hashes, self._keys
+        removed = keys[index]
+        mask = self._capacity - 1
+        # обратный сдвиг: подтягиваем следующие элементы, пока они не в своей домашней ячейке
+        following = (index + 1) & mask
+        while hashes[following] != _EMPTY and self._home(hashes[following]) != following:
+            hashes[index] = hashes[following]
+            keys[index] = keys[following]
+            index = following
+            following = (following + 1) & mask
+        hashes[index] = _EMPTY
+        keys[index] = None
+        self._size -= 1
+        return removed
+
+    # Приватный вспомогательный метод для увеличения таблицы.
+    # Хэши берутся из `_hashes`, `hash()` повторно не вызывается.
+    def _resize(self):
+        old_hashes, old_keys = self._hashes, self._keys
+        self._bits += 1
+        self._capacity = 1 << self._bits
+        self._max_dist = 0
+        self._hashes = array('q', [_EMPTY]) * self._capacity
+        self._keys = [None] * self._capacity
+        for h, key in zip(old_hashes, old_keys):
+            if h != _EMPTY:
+                self._insert(h, key)
+
+    def __len__(self):
+        return self._size
+
+    def __contains__(self, key):
+        return self._lookup(key, hash(key)) >= 0
+
+    # Строковое представление объекта (только живые ключи)
+    def __str__(self):
+        return str([k for h, k in zip(self._hashes, self._keys) if h != _EMPTY])
+
+
+# Тесты
+import unittest
+
+
+class TestHashTableRobinHood(unittest.TestCase):
+    def setUp(self):
+        self.table = HashTableRobinHood()
+
+    def test_push_find_pop(self):
+        self.table.push("apple")
+        self.table.push("banana")
+        self.table.push("apple")
+        self.assertEqual(len(self.table), 2)
+        self.assertEqual(self.table.find("apple"), "apple")
+        self.assertIsNone(self.table.find("orange"))
+        self.assertEqual(self.table.pop("apple"), "apple")
+        self.assertIsNone(self.table.pop("apple"))
+        self.assertIsNone(self.table.find("apple"))
+        self.assertEqual(self.table.find("banana"), "banana")
+
+    def test_skewed_keys(self):
+        # ключи, кратные степени двойки - худший случай для hash(key) % capacity
+        keys = [i * 1024 for i in range(5000)]
+        for key in keys:
+            self.table.push(key)
+        self.assertEqual(len(self.table), 5000)
+        self.assertLess(self.table._max_dist, 32)
+        for key in keys:
+            self.assertEqual(self.table.find(key), key)
+        self.assertIsNone(self.table.find(3))
+
+    def test_backward_shift_delete(self):
+        for i in range(2000):
+            self.table.push(i)
+        for i in range(0, 2000, 3):
+            self.assertEqual(self.table.pop(i), i)
+        for i in range(2000):
+            self.assertEqual(i in self.table, i % 3 != 0)
+        # после удалений обратным сдвигом все элементы по-прежнему упорядочены по правилу Robin Hood
+        mask = self.table._capacity - 1
+        hashes = self.table._hashes
+        for index, h in enumerate(hashes):
+            following = hashes[(index + 1) & mask]
+            if h != -1 and following != -1:
+                dist = (index - self.table._home(h)) & mask
+                following_dist = ((index + 1) - self.table._home(following)) & mask
+                self.assertLessEqual(following_dist, dist + 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -16,11 +16,20 @@
 # Класс, реализующий структуру данных "минимальная куча" (Min Heap).
 class MinHeap():
     # Инициализатор класса.
-    def __init__(self):
+    # key - функция, вычисляющая приоритет элемента (как в sorted). Приоритеты хранятся
+    # в отдельном параллельном списке self.keys, и в просеиваниях сравниваются только они -
+    # не нужно заворачивать элементы в кортежи (priority, counter, obj).
+    # max_heap=True переворачивает порядок: в корне - наибольший элемент (get_min/pop_min
+    # тогда возвращают максимум).
+    def __init__(self, key=None, max_heap=False):
         # Инициализирует пустой список для хранения элементов кучи.
         # Куча будет представлена в виде списка, где элементы упорядочены
         # согласно свойствам бинарной кучи.
         self.heap = []
+        self.key = key
+        self.max_heap = max_heap
+        # Параллельный список приоритетов: self.keys[i] = key(self.heap[i]).
+        self.keys = [] if key is not None else None
 
     # Возвращает индекс родительского узла для узла с заданным индексом.
     def parent(self, index):
@@ -62,6 +71,9 @@ class MinHeap():
     # Элемент с индексом 'index' "всплывает" вверх по куче до тех пор,
     # пока он не станет больше или равен своему родителю, или не достигнет корня.
     def sift_up(self, index):
+        # С функцией key или в max-куче работает отдельная реализация.
+        if self.keys is not None or self.max_heap:
+            return self._sift_up_keyed(index)
         # Получаем индекс родителя.
         parent_idx = self.parent(index)
         # Цикл продолжается, пока элемент не в корне (index > 0)
@@ -80,6 +92,9 @@ class MinHeap():
     # если этот дочерний элемент меньше текущего. Процесс повторяется,
     # пока элемент не станет меньше или равен своим детям, или не достигнет листа.
     def sift_down(self, index):
+        # С функцией key или в max-куче работает отдельная реализация.
+        if self.keys is not None or self.max_heap:
+            return self._sift_down_keyed(index)
         # Размер кучи для проверки границ.
         N = len(self.heap)
         # Цикл продолжается, пока у узла есть хотя бы один ребенок (левый).
@@ -112,6 +127,59 @@ class MinHeap():
             # Переходим на уровень ниже (к индексу наименьшего ребенка) для продолжения просеивания.
             index = min_child_idx
 
+    # "Всплытие" по приоритетам (self.keys или сами элементы в max-куче).
+    # Работает "дыркой": элементы и приоритеты сдвигаются, а поднимаемый элемент
+    # записывается один раз в конце, поэтому два списка не приходится менять местами.
+    def _sift_up_keyed(self, index):
+        heap = self.heap
+        keys = self.keys
+        priorities = heap if keys is None else keys
+        max_heap = self.max_heap
+        item = heap[index]
+        priority = priorities[index]
+        while index > 0:
+            parent_idx = (index - 1) // 2
+            parent_priority = priorities[parent_idx]
+            if not ((priority > parent_priority) if max_heap else (priority < parent_priority)):
+                break
+            heap[index] = heap[parent_idx]
+            if keys is not None:
+                keys[index] = parent_priority
+            index = parent_idx
+        heap[index] = item
+        if keys is not None:
+            keys[index] = priority
+
+    # "Просеивание" вниз по приоритетам, тоже "дыркой".
+    def _sift_down_keyed(self, index):
+        heap = self.heap
+        keys = self.keys
+        priorities = heap if keys is None else keys
+        max_heap = self.max_heap
+        N = len(heap)
+        item = heap[index]
+        priority = priorities[index]
+        while True:
+            child = index * 2 + 1
+            if child >= N:
+                break
+            child_priority = priorities[child]
+            right = child + 1
+            if right < N:
+                right_priority = priorities[right]
+                if (right_priority > child_priority) if max_heap else (right_priority < child_priority):
+                    child = right
+                    child_priority = right_priority
+            if not ((child_priority > priority) if max_heap else (child_priority < priority)):
+                break
+            heap[index] = heap[child]
+            if keys is not None:
+                keys[index] = child_priority
+            index = child
+        heap[index] = item
+        if keys is not None:
+            keys[index] = priority
+
     # Удаляет и возвращает минимальный элемент кучи (корень).
     def pop_min(self):
         # Если куча пуста, вернуть None (или можно выбросить исключение).
@@ -123,11 +191,15 @@ class MinHeap():
         # Если в куче больше одного элемента, перемещаем последний элемент в корень.
         if len(self.heap) > 1:
             self.heap[0] = self.heap.pop(-1) # pop(-1) удаляет и возвращает последний элемент
+            if self.keys is not None:
+                self.keys[0] = self.keys.pop()
             # Восстанавливаем свойство кучи, просеивая новый корень вниз.
             self.sift_down(0)
         else:
             # Если в куче был только один элемент, просто очищаем ее.
             self.heap.pop(0)
+            if self.keys is not None:
+                self.keys.pop()
 
         # Возвращаем сохраненный минимальный элемент.
         return min_elem
@@ -136,6 +208,8 @@ class MinHeap():
     def push(self, value):
         # Добавляем элемент в конец списка (на позицию нового листа).
         self.heap.append(value)
+        if self.keys is not None:
+            self.keys.append(self.key(value))
         # Восстанавливаем свойство кучи, поднимая новый элемент вверх ("всплытие").
         self.sift_up(len(self.heap) - 1)
 
@@ -145,6 +219,12 @@ class MinHeap():
     def heapify(self, arr):
         # Используем переданный список как основу для кучи.
         self.heap = list(arr) # Создаем копию, чтобы не изменять оригинальный список arr
+        if self.keys is not None:
+            self.keys = list(map(self.key, self.heap))
+        self._build()
+
+    # Восстанавливает свойство кучи для всего списка self.heap снизу вверх за O(n).
+    def _build(self):
         # Начинаем с последнего узла, у которого есть дети (индекс N//2 - 1), и идем к корню.
         # Для каждого такого узла вызываем sift_down. Листовые элементы (с индекса N//2 до N-1)
         # уже являются кучами из одного элемента.
@@ -153,6 +233,35 @@ class MinHeap():
             # для поддерева с корнем i.
             self.sift_down(i)
 
+    # Добавляет в кучу сразу много элементов.
+    # k элементов можно добавить двумя способами:
+    # - k раз "всплыть" - O(k log n);
+    # - дописать их в конец и перестроить всю кучу снизу вверх - O(n + k).
+    # Выбираем тот, что дешевле.
+    def push_many(self, iterable):
+        start = len(self.heap)
+        self.heap.extend(iterable)
+        if self.keys is not None:
+            self.keys.extend(map(self.key, self.heap[start:]))
+        self._sift_appended(start)
+
+    # Восстанавливает свойство кучи после того, как в конец списка дописаны
+    # элементы с индексами start..N-1.
+    def _sift_appended(self, start):
+        total = len(self.heap)
+        if (total - start) * total.bit_length() > total:
+            self._build()
+        else:
+            # Каждый новый элемент поднимается только по своим предкам,
+            # которые уже образуют корректную кучу.
+            for i in range(start, total):
+                self.sift_up(i)
+
+    # Сливает в эту кучу элементы другой кучи за O(n + m).
+    # Куча other не изменяется.
+    def merge(self, other):
+        self.push_many(other.heap)
+
     # Проверяет, пуста ли куча.
     def is_empty(self):
         # Куча пуста, если ее внутренний список не содержит элементов.
@@ -165,6 +274,80 @@ class MinHeap():
         return str(self.heap)
 
 
+# Ленивое k-путевое слияние отсортированных последовательностей (например, файлов-спиллов).
+# В куче одновременно лежит не больше одного элемента от каждой последовательности,
+# поэтому память - O(количество последовательностей), а входы не материализуются.
+# key - функция, по значению которой отсортированы входы (как в sorted).
+# При равных ключах раньше выдаются элементы из более ранней последовательности (слияние стабильно).
+def merge(*iterables, key=None):
+    heap = MinHeap()
+    # Запись кучи: [ключ, номер последовательности, значение, итератор].
+    # Номер уникален, поэтому до сравнения самих значений и итераторов дело не доходит.
+    entries = []
+    for order, iterable in enumerate(iterables):
+        iterator = iter(iterable)
+        for value in iterator:
+            entries.append([value if key is None else key(value), order, value, iterator])
+            break
+    heap.heapify(entries)
+    while heap.heap:
+        entry = heap.heap[0]
+        yield entry[2]
+        for value in entry[3]:
+            # Есть следующий элемент - кладем его на место корня и просеиваем вниз.
+            entry[0] = value if key is None else key(value)
+            entry[2] = value
+            heap.sift_down(0)
+            break
+        else:
+            # Последовательность закончилась.
+            heap.pop_min()
+
+
+# Коллектор k наибольших элементов потока (например, для таблицы лидеров).
+# Внутри - минимальная куча размера k (с функцией key): в корне лежит наименьший
+# из текущих лидеров, и новый элемент попадает в топ только если он больше корня.
+# Память - O(k), каждый элемент обрабатывается за O(log k).
+class TopK:
+    # Инициализатор класса. k - размер топа, key - функция, по которой сравниваются элементы.
+    def __init__(self, k, key=None):
+        if k < 1:
+            raise ValueError('k должно быть положительным')
+        self.k = k
+        self.key = key
+        self._heap = MinHeap(key=key)
+
+    # Добавляет элемент в поток.
+    def push(self, item):
+        heap = self._heap
+        if len(heap.heap) < self.k:
+            heap.push(item)
+            return
+        priority = item if self.key is None else self.key(item)
+        top = heap.heap[0] if heap.keys is None else heap.keys[0]
+        # При равенстве остается элемент, пришедший раньше.
+        if priority > top:
+            heap.heap[0] = item
+            if heap.keys is not None:
+                heap.keys[0] = priority
+            heap.sift_down(0)
+
+    # Добавляет много элементов.
+    def push_many(self, iterable):
+        for item in iterable:
+            self.push(item)
+
+    # Возвращает текущий топ от большего к меньшему.
+    def result(self):
+        heap = self._heap
+        priorities = heap.heap if heap.keys is None else heap.keys
+        order = sorted(range(len(heap.heap)), key=priorities.__getitem__, reverse=True)
+        return [heap.heap[i] for i in order]
+
+    def __len__(self):
+        return len(self._heap.heap)
+
+
 import unittest
 
 
@@ -220,6 +403,88 @@ class TestMinHeap(unittest.TestCase):
         self.heap.pop_min()
         self.assertEqual(self.heap.get_max(), 10)
 
+    def test_push_many(self):
+        # маленький пакет в большую кучу - через sift_up, большой - через перестроение
+        self.heap.push_many(range(100, 0, -1))
+        self.heap.push_many([0, 50])
+        self.heap.push_many([])
+        self.assertEqual([self.heap.pop_min() for _ in range(102)], sorted(list(range(1, 101)) + [0, 50]))
+
+    def test_merge(self):
+        other = MinHeap()
+        self.heap.heapify([5, 1, 9])
+        other.heapify([4, 8, 2, 7])
+        self.heap.merge(other)
+        self.assertEqual([self.heap.pop_min() for _ in range(7)], [1, 2, 4, 5, 7, 8, 9])
+        self.assertEqual(other.get_min(), 2)
+
+
+class TestKeyedHeap(unittest.TestCase):
+    def test_key(self):
+        heap = MinHeap(key=lambda task: task['priority'])
+        tasks = [{'name': n, 'priority': p} for n, p in [('a', 3), ('b', 1), ('c', 2), ('d', 0)]]
+        for task in tasks:
+            heap.push(task)
+        self.assertEqual(heap.keys[0], 0)
+        self.assertEqual([heap.pop_min()['name'] for _ in range(4)], ['d', 'b', 'c', 'a'])
+        self.assertEqual(heap.keys, [])
+
+    def test_payload_is_never_compared(self):
+        class Payload:
+            def __lt__(self, other):
+                raise AssertionError('payload compared')
+            __gt__ = __lt__
+
+        heap = MinHeap(key=lambda pair: pair[0])
+        heap.push_many([(i % 5, Payload()) for i in range(50)])
+        heap.heapify([(i % 7, Payload()) for i in range(30)])
+        self.assertEqual([heap.pop_min()[0] for _ in range(30)], sorted(i % 7 for i in range(30)))
+
+    def test_max_heap(self):
+        heap = MinHeap(max_heap=True)
+        heap.heapify([5, 3, 8, 1])
+        heap.push(10)
+        self.assertEqual([heap.pop_min() for _ in range(5)], [10, 8, 5, 3, 1])
+
+    def test_max_heap_with_key(self):
+        heap = MinHeap(key=len, max_heap=True)
+        heap.push_many(['a', 'ccc', 'bb'])
+        self.assertEqual(heap.get_min(), 'ccc')
+        self.assertEqual([heap.pop_min() for _ in range(3)], ['ccc', 'bb', 'a'])
+
+
+class TestMergeAndTopK(unittest.TestCase):
+    def test_merge(self):
+        result = list(merge([1, 4, 7], [2, 5, 8], [], [0, 3, 6, 9]))
+        self.assertEqual(result, list(range(10)))
+
+    def test_merge_is_lazy_and_stable(self):
+        def stream(name, values):
+            for value in values:
+                yield (value, name)
+
+        merged = merge(stream('a', [1, 2, 2]), stream('b', [2, 3]), key=lambda pair: pair[0])
+        self.assertEqual(next(merged), (1, 'a'))
+        self.assertEqual(list(merged), [(2, 'a'), (2, 'a'), (2, 'b'), (3, 'b')])
+
+    def test_merge_with_key(self):
+        words = merge(['bb', 'ccc'], ['a', 'dddd'], key=len)
+        self.assertEqual(list(words), ['a', 'bb', 'ccc', 'dddd'])
+
+    def test_top_k(self):
+        top = TopK(3)
+        top.push_many([5, 1, 9, 3, 7, 9, 2])
+        self.assertEqual(top.result(), [9, 9, 7])
+        self.assertEqual(len(top), 3)
+
+    def test_top_k_with_key(self):
+        top = TopK(2, key=lambda player: player['score'])
+        top.push_many([{'name': 'a', 'score': 10}, {'name': 'b', 'score': 30},
+                       {'name': 'c', 'score': 30}, {'name': 'd', 'score': 20}])
+        self.assertEqual(sorted(player['name'] for player in top.result()), ['b', 'c'])
+        with self.assertRaises(ValueError):
+            TopK(0)
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,275 @@
+"""
+Индексированная минимальная куча (Indexed Min Heap).
+
+Обычная `MinHeap` умеет только `push` и `pop_min`. Если приоритет элемента меняется
+(алгоритм Дейкстры, менеджер таймаутов), приходится добавлять дубликат и пропускать
+устаревшие записи - куча разрастается в разы.
+
+Индексированная куча хранит элементы в том же списке `self.heap`, а дополнительно:
+- `self.priority` - словарь элемент -> приоритет (сравниваются только приоритеты);
+- `self.position` - словарь элемент -> индекс в `self.heap`, который обновляется
+  при каждом обмене внутри `sift_up`/`sift_down`.
+
+Благодаря этому:
+- `__contains__` - O(1);
+- `decrease_key`, `increase_key`, `update`, `remove` - O(log n): позиция элемента известна,
+  остается только просеять его вверх или вниз.
+
+Элементы должны быть хэшируемыми и уникальными.
+"""
+
+from Heap import MinHeap
+
+
+class IndexedMinHeap(MinHeap):
+    # Инициализатор класса.
+    def __init__(self):
+        super().__init__()
+        # элемент -> приоритет
+        self.priority = {}
+        # элемент -> индекс в self.heap
+        self.position = {}
+
+    # Меняет местами два элемента кучи и обновляет их позиции.
+    def _swap(self, i, j):
+        heap = self.heap
+        heap[i], heap[j] = heap[j], heap[i]
+        self.position[heap[i]] = i
+        self.position[heap[j]] = j
+
+    # "Всплытие" с обновлением позиций (сравниваются приоритеты).
+    def sift_up(self, index):
+        heap, priority = self.heap, self.priority
+        while index > 0:
+            parent_idx = self.parent(index)
+            if priority[heap[parent_idx]] <= priority[heap[index]]:
+                break
+            self._swap(index, parent_idx)
+            index = parent_idx
+
+    # "Просеивание" вниз с обновлением позиций (сравниваются приоритеты).
+    def sift_down(self, index):
+        heap, priority = self.heap, self.priority
+        N = len(heap)
+        while self.left_child(index) < N:
+            left = self.left_child(index)
+            right = self.right_child(index)
+            min_child_idx = index
+            if priority[heap[left]] < priority[heap[min_child_idx]]:
+                min_child_idx = left
+            if right < N and priority[heap[right]] < priority[heap[min_child_idx]]:
+                min_child_idx = right
+            if min_child_idx == index:
+                break
+            self._swap(index, min_child_idx)
+            index = min_child_idx
+
+    # Возвращает пару (элемент, приоритет) с минимальным приоритетом, не удаляя её.
+    def get_min(self):
+        item = super().get_min()
+        return item, self.priority[item]
+
+    # Добавляет элемент с приоритетом.
+    def push(self, item, priority):
+        if item in self.position:
+            raise ValueError(f'Элемент {item!r} уже есть в куче')
+        self.priority[item] = priority
+        self.position[item] = len(self.heap)
+        self.heap.append(item)
+        self.sift_up(len(self.heap) - 1)
+
+    # Удаляет и возвращает пару (элемент, приоритет) с минимальным приоритетом.
+    def pop_min(self):
+        if not self.heap:
+            return None
+        item = self.heap[0]
+        self._remove_at(0)
+        return item, self.priority.pop(item)
+
+    # Удаляет элемент, стоящий на позиции index: на его место ставится последний,
+    # который затем просеивается в нужную сторону.
+    def _remove_at(self, index):
+        item = self.heap[index]
+        last = self.heap.pop()
+        del self.position[item]
+        if index < len(self.heap):
+            self.heap[index] = last
+            self.position[last] = index
+            self.sift_up(index)
+            self.sift_down(self.position[last])
+
+    # Удаляет произвольный элемент и возвращает его приоритет.
+    def remove(self, item):
+        if item not in self.position:
+            raise KeyError(item)
+        self._remove_at(self.position[item])
+        return self.priority.pop(item)
+
+    # Уменьшает приоритет элемента (новый приоритет не может быть больше текущего).
+    def decrease_key(self, item, priority):
+        if priority > self.priority[item]:
+            raise ValueError('Новый приоритет больше текущего')
+        self.priority[item] = priority
+        self.sift_up(self.position[item])
+
+    # Увеличивает приоритет элемента (новый приоритет не может быть меньше текущего).
+    def increase_key(self, item, priority):
+        if priority < self.priority[item]:
+            raise ValueError('Новый приоритет меньше текущего')
+        self.priority[item] = priority
+        self.sift_down(self.position[item])
+
+    # Меняет приоритет элемента в любую сторону; если элемента нет - добавляет его.
+    def update(self, item, priority):
+        if item not in self.position:
+            self.push(item, priority)
+        elif priority < self.priority[item]:
+            self.decrease_key(item, priority)
+        else:
+            self.increase_key(item, priority)
+
+    # Строит кучу из пар (элемент, приоритет) за O(n).
+    def heapify(self, pairs):
+        self.heap = []
+        self.priority = {}
+        self.position = {}
+        self._append_pairs(pairs)
+        self._build()
+
+    # Дописывает пары (элемент, приоритет) в конец кучи, не восстанавливая ее свойство.
+    # Дубликаты проверяются до того, как что-либо добавлено: при ошибке куча не меняется.
+    def _append_pairs(self, pairs):
+        pairs = list(pairs)
+        seen = set()
+        for item, _ in pairs:
+            if item in self.position or item in seen:
+                raise ValueError(f'Элемент {item!r} уже есть в куче')
+            seen.add(item)
+        for item, priority in pairs:
+            self.priority[item] = priority
+            self.position[item] = len(self.heap)
+            self.heap.append(item)
+
+    # Добавляет сразу много пар (элемент, приоритет), см. MinHeap.push_many.
+    def push_many(self, pairs):
+        start = len(self.heap)
+        self._append_pairs(pairs)
+        self._sift_appended(start)
+
+    # Сливает в эту кучу элементы другой индексированной кучи (other не изменяется).
+    def merge(self, other):
+        self.push_many((item, other.priority[item]) for item in other.heap)
+
+    def __contains__(self, item):
+        return item in self.position
+
+    def __len__(self):
+        return len(self.heap)
+
+    def __str__(self):
+        return str([(item, self.priority[item]) for item in self.heap])
+
+
+import random
+import unittest
+
+
+class TestIndexedMinHeap(unittest.TestCase):
+    def setUp(self):
+        self.heap = IndexedMinHeap()
+
+    def assertHeapValid(self):
+        heap, priority = self.heap.heap, self.heap.priority
+        for i, item in enumerate(heap):
+            self.assertEqual(self.heap.position[item], i)
+            if i > 0:
+                self.assertLessEqual(priority[heap[(i - 1) // 2]], priority[item])
+
+    def test_push_and_pop_min(self):
+        for item, priority in [('a', 5), ('b', 3), ('c', 8), ('d', 1)]:
+            self.heap.push(item, priority)
+        self.assertEqual(self.heap.get_min(), ('d', 1))
+        self.assertEqual([self.heap.pop_min() for _ in range(4)], [('d', 1), ('b', 3), ('a', 5), ('c', 8)])
+        self.assertIsNone(self.heap.pop_min())
+        self.assertEqual(len(self.heap.position), 0)
+
+    def test_contains_and_duplicates(self):
+        self.heap.push('a', 1)
+        self.assertIn('a', self.heap)
+        self.assertNotIn('b', self.heap)
+        with self.assertRaises(ValueError):
+            self.heap.push('a', 2)
+
+    def test_decrease_and_increase_key(self):
+        for i in range(10):
+            self.heap.push(i, i * 10)
+        self.heap.decrease_key(9, -1)
+        self.assertEqual(self.heap.get_min(), (9, -1))
+        self.heap.increase_key(9, 100)
+        self.assertEqual(self.heap.get_min(), (0, 0))
+        with self.assertRaises(ValueError):
+            self.heap.decrease_key(0, 5)
+        with self.assertRaises(ValueError):
+            self.heap.increase_key(0, -5)
+        self.assertHeapValid()
+
+    def test_remove(self):
+        for i in range(10):
+            self.heap.push(i, i)
+        self.assertEqual(self.heap.remove(4), 4)
+        self.assertNotIn(4, self.heap)
+        with self.assertRaises(KeyError):
+            self.heap.remove(4)
+        self.assertHeapValid()
+        self.assertEqual([self.heap.pop_min()[0] for _ in range(9)], [0, 1, 2, 3, 5, 6, 7, 8, 9])
+
+    def test_random_updates(self):
+        rng = random.Random(0)
+        expected = {}
+        for step in range(2000):
+            item = rng.randrange(100)
+            action = rng.random()
+            if action < 0.6:
+                priority = rng.randrange(1000)
+                self.heap.update(item, priority)
+                expected[item] = priority
+            elif action < 0.8 and item in expected:
+                self.assertEqual(self.heap.remove(item), expected.pop(item))
+            elif expected:
+                item, priority = self.heap.pop_min()
+                self.assertEqual(priority, min(expected.values()))
+                self.assertEqual(expected.pop(item), priority)
+        self.assertHeapValid()
+
+    def test_heapify(self):
+        self.heap.heapify([('a', 5), ('b', 3), ('c', 8), ('d', 1), ('e', 2)])
+        self.assertHeapValid()
+        self.assertEqual([self.heap.pop_min()[0] for _ in range(5)], ['d', 'e', 'b', 'a', 'c'])
+
+    def test_push_many_and_merge(self):
+        self.heap.push_many((i, 100 - i) for i in range(100))
+        other = IndexedMinHeap()
+        other.push_many([('x', 50.5), ('y', -1)])
+        self.heap.merge(other)
+        self.assertHeapValid()
+        self.assertEqual(self.heap.pop_min(), ('y', -1))
+        self.heap.decrease_key('x', -2)
+        self.assertEqual(self.heap.pop_min(), ('x', -2))
+        self.assertEqual(len(self.heap), 100)
+
+    def test_push_many_with_duplicate_changes_nothing(self):
+        for i in range(5):
+            self.heap.push(i, i)
+        with self.assertRaises(ValueError):
+            self.heap.push_many([('z', -5), (2, 1)])
+        with self.assertRaises(ValueError):
+            self.heap.push_many([('y', -1), ('y', -2)])
+        self.assertNotIn('z', self.heap)
+        self.assertNotIn('y', self.heap)
+        self.assertEqual(len(self.heap), 5)
+        self.assertEqual(self.heap.get_min(), (0, 0))
+        self.assertHeapValid()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,191 @@
+"""
+Мин-макс куча (Min-Max Heap).
+
+`MinHeap.get_max` возвращает последний элемент списка, который не обязательно максимальный:
+чтобы честно найти максимум в минимальной куче, нужен полный перебор за O(n).
+
+Мин-макс куча хранится в таком же списке, как и `MinHeap` (полное бинарное дерево),
+но уровни дерева чередуются:
+- на четных уровнях (0, 2, 4, ...) - "минимальные" узлы: узел не больше всех своих потомков;
+- на нечетных уровнях (1, 3, 5, ...) - "максимальные" узлы: узел не меньше всех своих потомков.
+
+Поэтому минимум всегда в корне, а максимум - один из двух его детей:
+- get_min / get_max - O(1);
+- push / pop_min / pop_max - O(log n).
+
+При всплытии (`sift_up`) элемент сравнивается с дедушкой (через уровень), при просеивании
+вниз (`sift_down`) - с детьми и внуками. `heapify` и `pop_min` наследуются от `MinHeap`
+и работают без изменений, так как опираются на переопределенные `sift_up`/`sift_down`.
+"""
+
+from Heap import MinHeap
+
+
+class MinMaxHeap(MinHeap):
+    # Инициализатор класса. Параметры key и max_heap из MinHeap здесь не поддерживаются:
+    # sift_up/sift_down переопределены и сравнивают сами элементы, а max-куча не нужна -
+    # максимум и так доступен через get_max/pop_max.
+    def __init__(self):
+        super().__init__()
+
+    # Проверяет, находится ли узел на "минимальном" (четном) уровне.
+    @staticmethod
+    def _is_min_level(index):
+        return (index + 1).bit_length() % 2 == 1
+
+    # Максимальный элемент - корень, если он один, иначе больший из детей корня. O(1).
+    def get_max(self):
+        if self.is_empty():
+            raise ValueError('Массив пустой')
+        return self.heap[self._max_index()]
+
+    # Индекс максимального элемента.
+    def _max_index(self):
+        if len(self.heap) == 1:
+            return 0
+        if len(self.heap) == 2 or self.heap[1] >= self.heap[2]:
+            return 1
+        return 2
+
+    # Удаляет и возвращает максимальный элемент кучи.
+    def pop_max(self):
+        if not self.heap:
+            return None
+        index = self._max_index()
+        max_elem = self.heap[index]
+        last = self.heap.pop()
+        if index < len(self.heap):
+            self.heap[index] = last
+            self.sift_down(index)
+        return max_elem
+
+    # "Всплытие": сначала определяем, к какой половине (min или max) относится элемент,
+    # сравнивая его с родителем, затем поднимаем его через уровень (к дедушке).
+    def sift_up(self, index):
+        if index == 0:
+            return
+        heap = self.heap
+        parent_idx = self.parent(index)
+        if self._is_min_level(index):
+            if heap[index] > heap[parent_idx]:
+                heap[index], heap[parent_idx] = heap[parent_idx], heap[index]
+                self._sift_up_level(parent_idx, is_max=True)
+            else:
+                self._sift_up_level(index, is_max=False)
+        else:
+            if heap[index] < heap[parent_idx]:
+                heap[index], heap[parent_idx] = heap[parent_idx], heap[index]
+                self._sift_up_level(parent_idx, is_max=False)
+            else:
+                self._sift_up_level(index, is_max=True)
+
+    # Поднимает элемент по уровням одного типа (через одного), пока он лучше дедушки.
+    def _sift_up_level(self, index, is_max):
+        heap = self.heap
+        while index > 2:
+            grandparent = self.parent(self.parent(index))
+            if (heap[index] > heap[grandparent]) if is_max else (heap[index] < heap[grandparent]):
+                heap[index], heap[grandparent] = heap[grandparent], heap[index]
+                index = grandparent
+            else:
+                break
+
+    # "Просеивание" вниз: ищем лучшего среди детей и внуков
+    # (наименьшего на min-уровне, наибольшего на max-уровне).
+    def sift_down(self, index):
+        heap = self.heap
+        N = len(heap)
+        is_max = not self._is_min_level(index)
+        while self.left_child(index) < N:
+            left = self.left_child(index)
+            # дети и внуки: left, left + 1, и до четырех внуков начиная с 2 * left + 1
+            candidates = [left, left + 1] + list(range(2 * left + 1, 2 * left + 5))
+            best = left
+            for c in candidates:
+                if c < N and ((heap[c] > heap[best]) if is_max else (heap[c] < heap[best])):
+                    best = c
+            if not ((heap[best] > heap[index]) if is_max else (heap[best] < heap[index])):
+                break
+            heap[index], heap[best] = heap[best], heap[index]
+            if best <= left + 1:
+                # лучший - ребенок: ниже него уровней другого типа нет, готово
+                break
+            # лучший - внук: элемент мог оказаться "не в той половине" относительно родителя внука
+            parent_idx = self.parent(best)
+            if (heap[best] < heap[parent_idx]) if is_max else (heap[best] > heap[parent_idx]):
+                heap[best], heap[parent_idx] = heap[parent_idx], heap[best]
+            index = best
+
+
+import random
+import unittest
+
+
+class TestMinMaxHeap(unittest.TestCase):
+    def setUp(self):
+        self.heap = MinMaxHeap()
+
+    def test_get_min_and_max(self):
+        for value in [5, 3, 8, 1, 10, 7]:
+            self.heap.push(value)
+        self.assertEqual(self.heap.get_min(), 1)
+        self.assertEqual(self.heap.get_max(), 10)
+
+    def test_pop_both_ends(self):
+        for value in [4, 10, 2, 7, 9, 1]:
+            self.heap.push(value)
+        self.assertEqual(self.heap.pop_max(), 10)
+        self.assertEqual(self.heap.pop_min(), 1)
+        self.assertEqual(self.heap.pop_max(), 9)
+        self.assertEqual(self.heap.pop_min(), 2)
+        self.assertEqual(self.heap.pop_max(), 7)
+        self.assertEqual(self.heap.pop_max(), 4)
+        self.assertIsNone(self.heap.pop_max())
+        self.assertIsNone(self.heap.pop_min())
+        with self.assertRaises(ValueError):
+            self.heap.get_max()
+
+    def test_random_operations(self):
+        rng = random.Random(0)
+        expected = []
+        for _ in range(3000):
+            action = rng.random()
+            if action < 0.5 or not expected:
+                value = rng.randrange(500)
+                self.heap.push(value)
+                expected.append(value)
+            elif action < 0.75:
+                self.assertEqual(self.heap.pop_min(), min(expected))
+                expected.remove(min(expected))
+            else:
+                self.assertEqual(self.heap.pop_max(), max(expected))
+                expected.remove(max(expected))
+            if expected:
+                self.assertEqual(self.heap.get_min(), min(expected))
+                self.assertEqual(self.heap.get_max(), max(expected))
+
+    def test_rejects_min_heap_options(self):
+        with self.assertRaises(TypeError):
+            MinMaxHeap(key=lambda x: -x)
+        with self.assertRaises(TypeError):
+            MinMaxHeap(max_heap=True)
+
+    def test_heapify(self):
+        arr = list(range(100))
+        random.Random(1).shuffle(arr)
+        self.heap.heapify(arr)
+        result = [self.heap.pop_max() if i % 2 else self.heap.pop_min() for i in range(100)]
+        expected = []
+        low, high = 0, 99
+        for i in range(100):
+            if i % 2:
+                expected.append(high)
+                high -= 1
+            else:
+                expected.append(low)
+                low += 1
+        self.assertEqual(result, expected)
+
+
+if __name__ == "__main__":
+    unittest.main()
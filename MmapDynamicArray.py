@@ -0,0 +1,306 @@
+"""
+Динамический массив в файле, отображенном в память (`mmap`).
+
+Типизированный `MyDynamicArray` хранит числа в `array.array`. Чтобы сохранить его на диск,
+приходится сериализовать весь буфер (pickle) - это копия в памяти и минуты на больших массивах.
+`MmapDynamicArray` хранит те же данные прямо в файле:
+
+    заголовок (64 байта): magic, typecode, size, capacity
+    данные:               capacity элементов типа typecode подряд (машинное представление)
+
+- открытие существующего файла - O(1): читается только заголовок;
+- `push_back` растет геометрически (как `MyDynamicArray`, та же политика роста `growth`):
+  файл увеличивается через `truncate` и заново отображается в память;
+- несколько процессов могут открыть файл с `readonly=True` и читать одни и те же страницы
+  из page cache без собственных копий.
+
+Все остальное (индексы, срезы-memoryview, `extend`, `sum`/`min`/`max`/`argsort` и т.д.)
+наследуется от `MyDynamicArray`: внутренний `self.array` здесь - memoryview на область данных
+отображения. Перед ростом массива, `shrink_to_fit` и `close` все memoryview, полученные снаружи,
+должны быть освобождены: иначе отображение нельзя закрыть, операция бросает `BufferError`
+и массив остается прежним.
+"""
+
+import mmap
+import os
+import struct
+from array import array
+
+from DynamicArray import MyDynamicArray
+
+_MAGIC = b'DAMMAP01'
+# magic, typecode, size, capacity
+_HEADER = struct.Struct('<8scxxxxxxxQQ')
+_HEADER_SIZE = 64
+# смещение поля size в заголовке - обновляется после каждой вставки/удаления
+_SIZE = struct.Struct('<Q')
+_SIZE_OFFSET = 16
+
+
+class MmapDynamicArray(MyDynamicArray):
+    # конструктор: открывает существующий файл или создает новый
+    # typecode - тип элементов нового файла ('q' по умолчанию); для существующего файла
+    # берется из заголовка (если typecode передан, он должен совпадать).
+    def __init__(self, path, typecode=None, capacity=1024, readonly=False, growth='double'):
+        self._path = path
+        self._readonly = readonly
+        self._mm = None
+        if os.path.exists(path):
+            self._file = open(path, 'rb' if readonly else 'r+b')
+            header = self._file.read(_HEADER_SIZE)
+            if len(header) < _HEADER_SIZE or header[:8] != _MAGIC:
+                self._file.close()
+                raise ValueError(f'{path} is not a dynamic array file')
+            _, stored, size, capacity = _HEADER.unpack_from(header)
+            stored = stored.decode()
+            if typecode is not None and typecode != stored:
+                self._file.close()
+                raise ValueError(f'{path} stores {stored!r} items, not {typecode!r}')
+            super().__init__(stored, growth)
+            self._size, self._capacity = size, capacity
+            self._map()
+        else:
+            if readonly:
+                raise FileNotFoundError(path)
+            super().__init__(typecode or 'q', growth)
+            self._capacity = max(capacity, 1)
+            self._file = open(path, 'w+b')
+            self._file.truncate(self._file_size(self._capacity))
+            self._map()
+            _HEADER.pack_into(self._mm, 0, _MAGIC, self.typecode.encode(), self._size, self._capacity)
+
+    # отображает файл в память; self.array - типизированный memoryview на область данных
+    def _map(self):
+        access = mmap.ACCESS_READ if self._readonly else mmap.ACCESS_WRITE
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=access)
+        self._view()
+
+    # self.array - типизированный memoryview на область данных текущего отображения
+    def _view(self):
+        end = _HEADER_SIZE + self._capacity * self._itemsize()
+        self.array = memoryview(self._mm)[_HEADER_SIZE:end].cast(self.typecode)
+
+    # Снимает отображение (собственный memoryview освобождается первым).
+    # Если снаружи остались memoryview, mmap не закрывается (BufferError) - тогда
+    # свой memoryview создается заново и массив остается в прежнем состоянии.
+    def _unmap(self):
+        self.array.release()
+        try:
+            self._mm.close()
+        except BufferError:
+            self._view()
+            raise BufferError('release memoryviews of the array before resizing or closing it') from None
+
+    # Создает файл path и заполняет его элементами iterable.
+    @classmethod
+    def from_iterable(cls, path, iterable, typecode=None):
+        arr = cls(path, typecode)
+        arr.extend(iterable)
+        return arr
+
+    def _itemsize(self):
+        return array(self.typecode).itemsize
+
+    def _file_size(self, capacity):
+        return _HEADER_SIZE + capacity * self._itemsize()
+
+    def _write_size(self):
+        _SIZE.pack_into(self._mm, _SIZE_OFFSET, self._size)
+
+    def _check_writable(self):
+        if self._readonly:
+            raise PermissionError('array is opened read-only')
+
+    # Изменение емкости: файл увеличивается (или уменьшается) и отображается заново.
+    # Данные остаются на месте в файле, поэтому копирования элементов нет.
+    # Отображение снимается до изменения файла: при BufferError ничего не меняется.
+    def _resize(self, new_capacity):
+        self._check_writable()
+        self._unmap()
+        self._file.truncate(self._file_size(new_capacity))
+        self._capacity = new_capacity
+        self._map()
+        _HEADER.pack_into(self._mm, 0, _MAGIC, self.typecode.encode(), self._size, self._capacity)
+        self._resize_count += 1
+
+    def push_back(self, item):
+        self._check_writable()
+        super().push_back(item)
+        self._write_size()
+
+    def pop_back(self):
+        self._check_writable()
+        item = super().pop_back()
+        self._write_size()
+        return item
+
+    # Сжатие необязательно: пока снаружи есть memoryview, файл просто остается больше,
+    # а элемент уже снят с массива и не должен потеряться из-за BufferError.
+    def _shrink(self):
+        try:
+            super()._shrink()
+        except BufferError:
+            pass
+
+    # Принимает и другой MyDynamicArray (его буфер копируется одним блоком).
+    def extend(self, iterable):
+        self._check_writable()
+        if isinstance(iterable, MyDynamicArray) and iterable.typecode == self.typecode:
+            iterable = iterable.memoryview()
+        super().extend(iterable)
+        self._write_size()
+
+    def __setitem__(self, index, value):
+        self._check_writable()
+        super().__setitem__(index, value)
+
+    # сбрасывает изменения на диск
+    def flush(self):
+        if not self._readonly:
+            self._mm.flush()
+
+    def close(self):
+        if self._mm is not None and not self._mm.closed:
+            self.flush()
+            self._unmap()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self._size
+
+
+# Тесты
+import shutil
+import subprocess
+import sys
+import tempfile
+import unittest
+
+
+class TestMmapDynamicArray(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.dir, 'array.bin')
+
+    def tearDown(self):
+        shutil.rmtree(self.dir)
+
+    def test_push_pop_and_index(self):
+        with MmapDynamicArray(self.path, 'q', capacity=2) as arr:
+            for i in range(100):
+                arr.push_back(i * 10)
+            self.assertEqual(arr.size(), 100)
+            self.assertEqual(arr.capacity(), 128)
+            self.assertEqual(arr[42], 420)
+            arr[42] = -1
+            self.assertEqual(arr[42], -1)
+            self.assertEqual(arr.pop_back(), 990)
+            self.assertEqual(arr[10:13].tolist(), [100, 110, 120])
+            self.assertEqual(arr.sum(), sum(range(99)) * 10 - 421)
+            with self.assertRaises(IndexError):
+                arr[99]
+        self.assertEqual(os.path.getsize(self.path), 64 + 128 * 8)
+
+    def test_persistence(self):
+        with MmapDynamicArray(self.path, 'd') as arr:
+            arr.extend(i / 4 for i in range(1000))
+        with MmapDynamicArray(self.path) as arr:
+            self.assertEqual(arr.typecode, 'd')
+            self.assertEqual(len(arr), 1000)
+            self.assertEqual(arr[999], 999 / 4)
+            arr.push_back(-1.0)
+        with MmapDynamicArray(self.path, 'd') as arr:
+            self.assertEqual(arr[1000], -1.0)
+        with self.assertRaises(ValueError):
+            MmapDynamicArray(self.path, 'q')
+
+    def test_checkpoint_from_dynamic_array(self):
+        source = MyDynamicArray.from_iterable(range(5000), typecode='q')
+        with MmapDynamicArray(self.path, 'q', capacity=1) as arr:
+            arr.extend(source)
+            self.assertEqual(arr._resize_count, 1)
+            self.assertEqual(arr.memoryview().tobytes(), source.memoryview().tobytes())
+
+    def test_readonly_sharing(self):
+        with MmapDynamicArray(self.path, 'q') as arr:
+            arr.extend(range(10))
+        with MmapDynamicArray(self.path, readonly=True) as arr:
+            self.assertTrue(arr.memoryview().readonly)
+            self.assertEqual(arr.max(), 9)
+            with self.assertRaises(PermissionError):
+                arr.push_back(1)
+            with self.assertRaises(PermissionError):
+                arr[0] = 5
+            # другой процесс открывает тот же файл только на чтение одновременно с этим
+            code = ('import sys; sys.path.insert(0, sys.argv[2]); from MmapDynamicArray import MmapDynamicArray; '
+                    'arr = MmapDynamicArray(sys.argv[1], readonly=True); print(arr.sum()); arr.close()')
+            output = subprocess.run([sys.executable, '-c', code, self.path, os.path.dirname(os.path.abspath(__file__))],
+                                    capture_output=True, text=True, check=True).stdout
+            self.assertEqual(output.strip(), '45')
+        with self.assertRaises(FileNotFoundError):
+            MmapDynamicArray(os.path.join(self.dir, 'missing.bin'), readonly=True)
+
+    def test_shrink_and_not_an_array(self):
+        with MmapDynamicArray(self.path, 'B', capacity=64) as arr:
+            arr.extend(range(60))
+            for _ in range(55):
+                arr.pop_back()
+            arr.shrink_to_fit()
+            self.assertEqual(arr.capacity(), 5)
+            self.assertEqual(arr[0:5].tolist(), [0, 1, 2, 3, 4])
+        self.assertEqual(os.path.getsize(self.path), 64 + 5)
+        other = os.path.join(self.dir, 'other.bin')
+        with open(other, 'wb') as f:
+            f.write(b'\0' * 128)
+        with self.assertRaises(ValueError):
+            MmapDynamicArray(other)
+
+    def test_exported_view_blocks_resize_and_close(self):
+        arr = MmapDynamicArray(self.path, 'q', capacity=4)
+        arr.extend(range(4))
+        view = arr[0:2]
+        with self.assertRaises(BufferError):
+            arr.push_back(4)
+        with self.assertRaises(BufferError):
+            arr.close()
+        # массив не сломан: те же размер, емкость и данные
+        self.assertEqual((arr.size(), arr.capacity()), (4, 4))
+        self.assertEqual(arr[3], 3)
+        self.assertEqual(view.tolist(), [0, 1])
+        self.assertEqual(os.path.getsize(self.path), 64 + 4 * 8)
+        view.release()
+        arr.push_back(4)
+        self.assertEqual(arr[0:5].tolist(), [0, 1, 2, 3, 4])
+        arr.close()
+
+    def test_pop_with_exported_view(self):
+        arr = MmapDynamicArray(self.path, 'q', capacity=16)
+        arr.extend(range(4))
+        view = arr[0:2]
+        # 3 < 16 // 4 - pop_back хочет сжать массив, но view не дает снять отображение
+        self.assertEqual(arr.pop_back(), 3)
+        self.assertEqual(len(arr), 3)
+        self.assertEqual(arr.capacity(), 16)
+        self.assertEqual(view.tolist(), [0, 1])
+        view.release()
+        arr.close()
+        with MmapDynamicArray(self.path) as arr:
+            self.assertEqual(len(arr), 3)
+            self.assertEqual(arr[0:3].tolist(), [0, 1, 2])
+
+    def test_from_iterable(self):
+        with MmapDynamicArray.from_iterable(self.path, range(10), typecode='i') as arr:
+            self.assertEqual(arr.typecode, 'i')
+            self.assertEqual(arr.sum(), 45)
+        with MmapDynamicArray(self.path) as arr:
+            self.assertEqual(len(arr), 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
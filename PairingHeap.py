@@ -0,0 +1,134 @@
+"""
+Парная куча (Pairing Heap).
+
+Куча-дерево произвольной арности на узлах (а не на массиве, как `MinHeap`). Каждый узел хранит
+значение, ссылку на первого ребенка (`child`) и на следующего брата (`sibling`).
+Главная операция - слияние (meld) двух деревьев: корень с большим значением просто становится
+первым ребенком корня с меньшим. Это O(1).
+
+Сложность:
+- get_min, push, merge - O(1);
+- pop_min - амортизированно O(log n): дети удаленного корня сливаются попарно слева направо,
+  а затем получившиеся деревья - справа налево ("двухпроходное" слияние).
+
+Удобна там, где кучи часто объединяются (например, слияние шардов), - у `MinHeap.merge`
+это O(n + m).
+"""
+
+
+class PairingHeap:
+    class Node:
+        def __init__(self, value):
+            self.value = value
+            self.child = None
+            self.sibling = None
+
+    # Инициализатор класса.
+    def __init__(self):
+        self.root = None
+        self._size = 0
+
+    # Сливает два дерева: больший корень становится первым ребенком меньшего. O(1).
+    @staticmethod
+    def _meld(a, b):
+        if a is None:
+            return b
+        if b is None:
+            return a
+        if b.value < a.value:
+            a, b = b, a
+        b.sibling = a.child
+        a.child = b
+        return a
+
+    # Возвращает минимальный элемент кучи (корень), не удаляя его.
+    def get_min(self):
+        if self.root is None:
+            raise ValueError('Массив пустой')
+        return self.root.value
+
+    # Добавляет новый элемент в кучу. O(1).
+    def push(self, value):
+        self.root = self._meld(self.root, self.Node(value))
+        self._size += 1
+
+    # Добавляет сразу много элементов.
+    def push_many(self, iterable):
+        for value in iterable:
+            self.push(value)
+
+    # Удаляет и возвращает минимальный элемент кучи (корень).
+    def pop_min(self):
+        if self.root is None:
+            return None
+        min_elem = self.root.value
+        # Первый проход: сливаем детей корня попарно слева направо.
+        pairs = []
+        node = self.root.child
+        while node is not None:
+            first = node
+            second = node.sibling
+            node = second.sibling if second is not None else None
+            first.sibling = None
+            if second is not None:
+                second.sibling = None
+            pairs.append(self._meld(first, second))
+        # Второй проход: сливаем получившиеся деревья справа налево.
+        root = None
+        for tree in reversed(pairs):
+            root = self._meld(tree, root)
+        self.root = root
+        self._size -= 1
+        return min_elem
+
+    # Забирает все элементы кучи other за O(1); other становится пустой.
+    def merge(self, other):
+        self.root = self._meld(self.root, other.root)
+        self._size += other._size
+        other.root = None
+        other._size = 0
+
+    # Проверяет, пуста ли куча.
+    def is_empty(self):
+        return self.root is None
+
+    def __len__(self):
+        return self._size
+
+
+import random
+import unittest
+
+
+class TestPairingHeap(unittest.TestCase):
+    def setUp(self):
+        self.heap = PairingHeap()
+
+    def test_push_and_pop_min(self):
+        for value in [5, 3, 8, 1]:
+            self.heap.push(value)
+        self.assertEqual(self.heap.get_min(), 1)
+        self.assertEqual([self.heap.pop_min() for _ in range(4)], [1, 3, 5, 8])
+        self.assertIsNone(self.heap.pop_min())
+        self.assertTrue(self.heap.is_empty())
+        with self.assertRaises(ValueError):
+            self.heap.get_min()
+
+    def test_merge(self):
+        other = PairingHeap()
+        self.heap.push_many([5, 1, 9])
+        other.push_many([4, 8, 2, 7])
+        self.heap.merge(other)
+        self.assertTrue(other.is_empty())
+        self.assertEqual(len(self.heap), 7)
+        self.assertEqual([self.heap.pop_min() for _ in range(7)], [1, 2, 4, 5, 7, 8, 9])
+
+    def test_random(self):
+        rng = random.Random(0)
+        values = [rng.randrange(10000) for _ in range(5000)]
+        self.heap.push_many(values)
+        self.assertEqual([self.heap.pop_min() for _ in range(5000)], sorted(values))
+
+
+if __name__ == "__main__":
+    unittest.main()
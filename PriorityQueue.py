@@ -0,0 +1,334 @@
+"""
+Очереди с приоритетом для потоков и корутин поверх `MinHeap`.
+
+`MinHeap` не потокобезопасна: если ее наполняют несколько потоков-производителей, вокруг
+`push`/`pop_min` приходится вручную писать блокировку и пробуждение потребителей.
+
+`PriorityQueue` - блокирующая очередь для потоков (по образцу `queue.Queue`):
+- одна блокировка и две условные переменные (`threading.Condition`): "не пусто" и "не полно";
+- `get` ждет появления элемента, `put` при заданном `maxsize` ждет свободного места
+  (обратное давление на производителей);
+- таймауты: по истечении `get` бросает `queue.Empty`, а `put` - `queue.Full`;
+- `get_many(n)` забирает до n элементов за один захват блокировки.
+
+`AsyncPriorityQueue` - то же самое для asyncio: `await put(...)`, `await get()`,
+`await get_many(n)` (таймауты - через `asyncio.wait_for`). Ошибки - `asyncio.QueueEmpty`
+и `asyncio.QueueFull`.
+
+Первым выдается минимальный элемент (или элемент с минимальным `key(item)`, см. `MinHeap`).
+"""
+
+import asyncio
+import queue
+import threading
+import time
+
+from Heap import MinHeap
+
+
+class PriorityQueue:
+    # Инициализатор класса. maxsize <= 0 - очередь без ограничения размера.
+    def __init__(self, maxsize=0, key=None):
+        self.maxsize = maxsize
+        self._heap = MinHeap(key=key)
+        self._mutex = threading.Lock()
+        self._not_empty = threading.Condition(self._mutex)
+        self._not_full = threading.Condition(self._mutex)
+
+    # Проверяет заполненность; вызывается под блокировкой.
+    def _is_full(self):
+        return 0 < self.maxsize <= len(self._heap.heap)
+
+    # Ждет выполнения predicate на условной переменной. timeout=None - ждать бесконечно.
+    # Возвращает False, если время вышло.
+    @staticmethod
+    def _wait(condition, predicate, block, timeout):
+        if predicate():
+            return True
+        if not block:
+            return False
+        if timeout is None:
+            while not predicate():
+                condition.wait()
+            return True
+        if timeout < 0:
+            raise ValueError("timeout должен быть неотрицательным")
+        deadline = time.monotonic() + timeout
+        while not predicate():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return False
+            condition.wait(remaining)
+        return True
+
+    # Добавляет элемент. Если очередь полна, ждет свободного места (или бросает queue.Full).
+    def put(self, item, block=True, timeout=None):
+        with self._not_full:
+            if not self._wait(self._not_full, lambda: not self._is_full(), block, timeout):
+                raise queue.Full
+            self._heap.push(item)
+            self._not_empty.notify()
+
+    # Удаляет и возвращает минимальный элемент. Если очередь пуста, ждет (или бросает queue.Empty).
+    def get(self, block=True, timeout=None):
+        with self._not_empty:
+            if not self._wait(self._not_empty, lambda: self._heap.heap, block, timeout):
+                raise queue.Empty
+            item = self._heap.pop_min()
+            self._not_full.notify()
+            return item
+
+    # Забирает до n минимальных элементов (по возрастанию) за один захват блокировки.
+    # Ждет только появления первого элемента, остальные - сколько есть.
+    def get_many(self, n, block=True, timeout=None):
+        with self._not_empty:
+            if not self._wait(self._not_empty, lambda: self._heap.heap, block, timeout):
+                raise queue.Empty
+            heap = self._heap
+            items = [heap.pop_min() for _ in range(min(n, len(heap.heap)))]
+            self._not_full.notify(len(items))
+            return items
+
+    def put_nowait(self, item):
+        self.put(item, block=False)
+
+    def get_nowait(self):
+        return self.get(block=False)
+
+    # Размер очереди (на момент вызова).
+    def qsize(self):
+        with self._mutex:
+            return len(self._heap.heap)
+
+    def empty(self):
+        return self.qsize() == 0
+
+    def full(self):
+        with self._mutex:
+            return self._is_full()
+
+    def __len__(self):
+        return self.qsize()
+
+
+class AsyncPriorityQueue:
+    # Инициализатор класса. maxsize <= 0 - очередь без ограничения размера.
+    def __init__(self, maxsize=0, key=None):
+        self.maxsize = maxsize
+        self._heap = MinHeap(key=key)
+        lock = asyncio.Lock()
+        self._not_empty = asyncio.Condition(lock)
+        self._not_full = asyncio.Condition(lock)
+        # Задачи-пробуждения из _wake: цикл событий хранит на задачи только слабые ссылки,
+        # поэтому без сильной ссылки задача может быть собрана до того, как разбудит ожидающего.
+        self._tasks = set()
+
+    def _is_full(self):
+        return 0 < self.maxsize <= len(self._heap.heap)
+
+    # Добавляет элемент, дожидаясь свободного места.
+    async def put(self, item):
+        async with self._not_full:
+            await self._not_full.wait_for(lambda: not self._is_full())
+            self._heap.push(item)
+            self._not_empty.notify()
+
+    # Удаляет и возвращает минимальный элемент, дожидаясь его появления.
+    async def get(self):
+        async with self._not_empty:
+            await self._not_empty.wait_for(lambda: self._heap.heap)
+            item = self._heap.pop_min()
+            self._not_full.notify()
+            return item
+
+    # Забирает до n минимальных элементов, дожидаясь хотя бы одного.
+    async def get_many(self, n):
+        async with self._not_empty:
+            await self._not_empty.wait_for(lambda: self._heap.heap)
+            heap = self._heap
+            items = [heap.pop_min() for _ in range(min(n, len(heap.heap)))]
+            self._not_full.notify(len(items))
+            return items
+
+    # Неблокирующие варианты. Корутины в asyncio выполняются по очереди, поэтому
+    # между проверкой и изменением кучи никто не вклинится и блокировка не нужна.
+    def put_nowait(self, item):
+        if self._is_full():
+            raise asyncio.QueueFull
+        self._heap.push(item)
+        self._wake(self._not_empty)
+
+    def get_nowait(self):
+        if not self._heap.heap:
+            raise asyncio.QueueEmpty
+        item = self._heap.pop_min()
+        self._wake(self._not_full)
+        return item
+
+    # Будит одного ожидающего вне async-контекста: notify требует захваченной блокировки,
+    # поэтому пробуждение планируется отдельной задачей (она хранится в self._tasks до завершения).
+    def _wake(self, condition):
+        async def notify():
+            async with condition:
+                condition.notify()
+
+        try:
+            task = asyncio.get_running_loop().create_task(notify())
+        except RuntimeError:
+            # Нет работающего цикла событий - значит, и ждать некому.
+            return
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    def qsize(self):
+        return len(self._heap.heap)
+
+    def empty(self):
+        return not self._heap.heap
+
+    def full(self):
+        return self._is_full()
+
+    def __len__(self):
+        return self.qsize()
+
+
+import unittest
+
+
+class TestPriorityQueue(unittest.TestCase):
+    def test_order_and_nowait(self):
+        q = PriorityQueue()
+        for value in [5, 1, 4, 2, 3]:
+            q.put(value)
+        self.assertEqual(len(q), 5)
+        self.assertEqual([q.get() for _ in range(5)], [1, 2, 3, 4, 5])
+        self.assertTrue(q.empty())
+        with self.assertRaises(queue.Empty):
+            q.get_nowait()
+
+    def test_key(self):
+        q = PriorityQueue(key=lambda task: task[0])
+        q.put((2, 'b'))
+        q.put((1, 'a'))
+        self.assertEqual(q.get(), (1, 'a'))
+
+    def test_timeouts_and_maxsize(self):
+        q = PriorityQueue(maxsize=2)
+        q.put(1)
+        q.put(2)
+        self.assertTrue(q.full())
+        with self.assertRaises(queue.Full):
+            q.put_nowait(3)
+        started = time.monotonic()
+        with self.assertRaises(queue.Full):
+            q.put(3, timeout=0.05)
+        self.assertGreaterEqual(time.monotonic() - started, 0.04)
+        self.assertEqual(q.get_many(10), [1, 2])
+        with self.assertRaises(queue.Empty):
+            q.get(timeout=0.01)
+
+    def test_blocking_get_wakes_up(self):
+        q = PriorityQueue()
+        result = []
+        consumer = threading.Thread(target=lambda: result.append(q.get(timeout=5)))
+        consumer.start()
+        time.sleep(0.02)
+        q.put(42)
+        consumer.join()
+        self.assertEqual(result, [42])
+
+    def test_producers_and_consumers(self):
+        q = PriorityQueue(maxsize=16)
+        received = []
+        lock = threading.Lock()
+
+        def producer(start):
+            for value in range(start, start + 500):
+                q.put(value)
+
+        def consumer():
+            while True:
+                try:
+                    items = q.get_many(8, timeout=0.05)
+                except queue.Empty:
+                    if produced.is_set():
+                        return
+                    continue
+                with lock:
+                    received.extend(items)
+
+        produced = threading.Event()
+        producers = [threading.Thread(target=producer, args=(n * 500,)) for n in range(4)]
+        consumers = [threading.Thread(target=consumer) for _ in range(2)]
+        for thread in producers + consumers:
+            thread.start()
+        for thread in producers:
+            thread.join()
+        produced.set()
+        for thread in consumers:
+            thread.join()
+        self.assertEqual(sorted(received), list(range(2000)))
+
+
+class TestAsyncPriorityQueue(unittest.TestCase):
+    def test_order_and_get_many(self):
+        async def main():
+            q = AsyncPriorityQueue()
+            for value in [3, 1, 2]:
+                await q.put(value)
+            first = await q.get()
+            rest = await q.get_many(10)
+            return first, rest
+
+        self.assertEqual(asyncio.run(main()), (1, [2, 3]))
+
+    def test_backpressure_and_timeout(self):
+        async def main():
+            q = AsyncPriorityQueue(maxsize=1)
+            await q.put(1)
+            with self.assertRaises(asyncio.QueueFull):
+                q.put_nowait(2)
+            with self.assertRaises(asyncio.TimeoutError):
+                await asyncio.wait_for(q.put(2), 0.01)
+            producer = asyncio.create_task(q.put(0))
+            await asyncio.sleep(0)
+            self.assertEqual(await q.get(), 1)
+            await producer
+            self.assertEqual(q.get_nowait(), 0)
+            with self.assertRaises(asyncio.QueueEmpty):
+                q.get_nowait()
+
+        asyncio.run(main())
+
+    def test_consumer_waits_for_producer(self):
+        async def main():
+            q = AsyncPriorityQueue()
+            consumer = asyncio.create_task(q.get())
+            await asyncio.sleep(0)
+            q.put_nowait(7)
+            return await asyncio.wait_for(consumer, 1)
+
+        self.assertEqual(asyncio.run(main()), 7)
+
+    def test_wake_task_is_kept_until_done(self):
+        import gc
+
+        async def main():
+            q = AsyncPriorityQueue()
+            consumer = asyncio.create_task(q.get())
+            await asyncio.sleep(0)
+            q.put_nowait(7)
+            self.assertEqual(len(q._tasks), 1)
+            # задача-пробуждение переживает сборку мусора
+            gc.collect()
+            result = await asyncio.wait_for(consumer, 1)
+            await asyncio.sleep(0)
+            self.assertEqual(q._tasks, set())
+            return result
+
+        self.assertEqual(asyncio.run(main()), 7)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,287 @@
+"""
+Иерархическое хэшированное колесо таймеров (Hierarchical Hashed Timing Wheel).
+
+Если хранить дедлайны в `MinHeap`, каждая вставка стоит O(log n), а отмененные таймеры
+остаются в куче до тех пор, пока не дойдут до корня. Для таймаутов (которые почти всегда
+отменяются до срабатывания) это лишняя работа.
+
+Колесо - это кольцевой массив из `wheel_size` слотов, каждый слот - словарь таймеров.
+Время дискретно (целые "тики"). Уровней несколько, как у часов со стрелками:
+- уровень 0: слот = deadline % size, покрывает ближайшие size тиков;
+- уровень 1: слот = (deadline // size) % size, покрывает size^2 тиков, и т.д.
+Когда младший уровень совершает полный оборот, слот следующего уровня "каскадируется":
+его таймеры перекладываются на младшие уровни, ближе к сроку.
+
+Сложность:
+- schedule - O(1): номер уровня и слота вычисляются арифметикой;
+- cancel - O(1): таймер помнит свой слот и просто удаляется из словаря;
+- advance - O(1) на тик плюс O(1) на каждое перекладывание таймера (не больше levels раз).
+
+Таймеры дальше, чем size^levels тиков, хранятся в `MinHeap` (переполнение) и переносятся
+в колесо, когда их срок приближается. Отмена в переполнении ленивая (флаг).
+
+Запуск `python TimingWheel.py --bench` сравнивает колесо с очередью на `MinHeap`.
+"""
+
+from Heap import MinHeap
+
+
+class Timer:
+    __slots__ = ('deadline', 'payload', 'cancelled', '_slot')
+
+    def __init__(self, deadline, payload):
+        self.deadline = deadline
+        self.payload = payload
+        self.cancelled = False
+        # словарь-слот, в котором лежит таймер (None - таймер в переполнении или уже сработал)
+        self._slot = None
+
+    def __repr__(self):
+        return f'Timer({self.deadline!r}, {self.payload!r})'
+
+
+class TimingWheel:
+    # Инициализатор класса.
+    # wheel_size - количество слотов на уровне (степень двойки), levels - количество уровней,
+    # start - текущее время (в тиках).
+    def __init__(self, wheel_size=256, levels=4, start=0):
+        if wheel_size < 2 or wheel_size & (wheel_size - 1):
+            raise ValueError('wheel_size должен быть степенью двойки')
+        if levels < 1:
+            raise ValueError('levels должно быть положительным')
+        self._size = wheel_size
+        self._bits = wheel_size.bit_length() - 1
+        self._mask = wheel_size - 1
+        self._levels = levels
+        # Горизонт колеса: таймеры дальше него уходят в переполнение.
+        self._span = wheel_size ** levels
+        self._wheels = [[{} for _ in range(wheel_size)] for _ in range(levels)]
+        self._overflow = MinHeap(key=lambda timer: timer.deadline)
+        self._current = start
+        # таймеры в колесе (без переполнения)
+        self._in_wheel = 0
+        # все активные таймеры
+        self._count = 0
+
+    # Текущее время колеса.
+    @property
+    def now(self):
+        return self._current
+
+    # Кладет таймер в слот по его расстоянию до текущего времени.
+    def _place(self, timer):
+        delta = timer.deadline - self._current
+        if delta >= self._span:
+            timer._slot = None
+            self._overflow.push(timer)
+            return
+        level = 0
+        limit = self._size
+        while delta >= limit:
+            level += 1
+            limit <<= self._bits
+        slot = self._wheels[level][(timer.deadline >> (self._bits * level)) & self._mask]
+        slot[timer] = None
+        timer._slot = slot
+        self._in_wheel += 1
+
+    # Планирует таймер на момент deadline (в тиках) и возвращает его.
+    # Просроченный дедлайн срабатывает на ближайшем тике.
+    def schedule(self, deadline, payload=None):
+        timer = Timer(max(deadline, self._current + 1), payload)
+        self._place(timer)
+        self._count += 1
+        return timer
+
+    # Планирует таймер через delay тиков от текущего времени.
+    def schedule_after(self, delay, payload=None):
+        return self.schedule(self._current + delay, payload)
+
+    # Отменяет таймер. Возвращает False, если он уже сработал или отменен.
+    def cancel(self, timer):
+        if timer.cancelled:
+            return False
+        slot = timer._slot
+        if slot is not None:
+            del slot[timer]
+            timer._slot = None
+            self._in_wheel -= 1
+        elif timer.deadline <= self._current:
+            # уже сработал
+            return False
+        # таймер из переполнения останется в куче, но будет пропущен
+        timer.cancelled = True
+        self._count -= 1
+        return True
+
+    # Переносит из переполнения таймеры, попавшие в горизонт колеса.
+    def _drain_overflow(self):
+        heap = self._overflow
+        horizon = self._current + self._span
+        while heap.heap and heap.keys[0] < horizon:
+            timer = heap.pop_min()
+            if not timer.cancelled:
+                self._place(timer)
+
+    # Продвигает время до now и возвращает payload сработавших таймеров
+    # (в порядке тиков).
+    def advance(self, now):
+        fired = []
+        bits, mask, wheels = self._bits, self._mask, self._wheels
+        while self._current < now:
+            if not self._in_wheel:
+                # Колесо пустое - перепрыгиваем пустые тики сразу.
+                target = now
+                if self._overflow.heap:
+                    target = min(now, max(self._current, self._overflow.keys[0] - self._span + 1))
+                if target > self._current:
+                    self._current = target
+                    self._drain_overflow()
+                    continue
+            self._current += 1
+            tick = self._current
+            # Каскад: при полном обороте уровня перекладываем слот следующего уровня.
+            level = 1
+            while level < self._levels and not (tick >> (bits * (level - 1))) & mask:
+                slot = wheels[level][(tick >> (bits * level)) & mask]
+                if slot:
+                    wheels[level][(tick >> (bits * level)) & mask] = {}
+                    self._in_wheel -= len(slot)
+                    for timer in slot:
+                        self._place(timer)
+                level += 1
+            if not tick & mask:
+                self._drain_overflow()
+            slot = wheels[0][tick & mask]
+            if slot:
+                wheels[0][tick & mask] = {}
+                self._in_wheel -= len(slot)
+                self._count -= len(slot)
+                for timer in slot:
+                    timer._slot = None
+                    fired.append(timer.payload)
+        return fired
+
+    def __len__(self):
+        return self._count
+
+
+# Очередь таймеров на MinHeap (для сравнения): отмена ленивая, отмененные записи
+# остаются в куче, пока не окажутся в корне.
+class HeapTimerQueue:
+    def __init__(self):
+        self._heap = MinHeap(key=lambda timer: timer.deadline)
+        self._current = 0
+
+    def schedule(self, deadline, payload=None):
+        timer = Timer(max(deadline, self._current + 1), payload)
+        self._heap.push(timer)
+        return timer
+
+    def cancel(self, timer):
+        timer.cancelled = True
+
+    def advance(self, now):
+        fired = []
+        heap = self._heap
+        while heap.heap and heap.keys[0] <= now:
+            timer = heap.pop_min()
+            if not timer.cancelled:
+                fired.append(timer.payload)
+        self._current = now
+        return fired
+
+
+# Бенчмарк: n таймеров со случайными дедлайнами в пределах horizon тиков, доля cancel_ratio
+# отменяется, затем время продвигается до конца. Возвращает время (сек) для колеса и кучи.
+def benchmark(n, horizon=100_000, cancel_ratio=0.9, seed=0):
+    import random
+    import time
+
+    rng = random.Random(seed)
+    deadlines = [rng.randrange(1, horizon) for _ in range(n)]
+    cancelled = set(rng.sample(range(n), int(n * cancel_ratio)))
+    results = []
+    for queue in (TimingWheel(), HeapTimerQueue()):
+        started = time.perf_counter()
+        timers = [queue.schedule(deadline, i) for i, deadline in enumerate(deadlines)]
+        for i in cancelled:
+            queue.cancel(timers[i])
+        fired = queue.advance(horizon)
+        results.append(time.perf_counter() - started)
+        assert len(fired) == n - len(cancelled)
+    return tuple(results)
+
+
+def run_benchmark():
+    print(f'{"n":>10} {"wheel, s":>10} {"heap, s":>10}')
+    for n in (1_000, 10_000, 100_000, 1_000_000):
+        wheel, heap = benchmark(n)
+        print(f'{n:>10} {wheel:>10.3f} {heap:>10.3f}')
+
+
+import random
+import unittest
+
+
+class TestTimingWheel(unittest.TestCase):
+    def test_fires_in_order(self):
+        wheel = TimingWheel(wheel_size=8, levels=2)
+        for deadline in [5, 1, 3, 70, 9, 64]:
+            wheel.schedule(deadline, deadline)
+        self.assertEqual(len(wheel), 6)
+        self.assertEqual(wheel.advance(4), [1, 3])
+        self.assertEqual(wheel.advance(10), [5, 9])
+        self.assertEqual(wheel.advance(100), [64, 70])
+        self.assertEqual(len(wheel), 0)
+
+    def test_cancel(self):
+        wheel = TimingWheel(wheel_size=4, levels=2)
+        near = wheel.schedule(2, 'near')
+        far = wheel.schedule(10, 'far')
+        overflow = wheel.schedule(1000, 'overflow')
+        self.assertTrue(wheel.cancel(near))
+        self.assertFalse(wheel.cancel(near))
+        self.assertTrue(wheel.cancel(overflow))
+        self.assertEqual(len(wheel), 1)
+        self.assertEqual(wheel.advance(2000), ['far'])
+        self.assertFalse(wheel.cancel(far))
+
+    def test_overdue_and_schedule_after(self):
+        wheel = TimingWheel(wheel_size=4, levels=1, start=100)
+        wheel.schedule(50, 'late')
+        wheel.schedule_after(3, 'soon')
+        self.assertEqual(wheel.advance(101), ['late'])
+        self.assertEqual(wheel.advance(103), ['soon'])
+        self.assertEqual(wheel.now, 103)
+
+    def test_matches_heap(self):
+        rng = random.Random(0)
+        wheel = TimingWheel(wheel_size=8, levels=3)
+        reference = HeapTimerQueue()
+        now = 0
+        for _ in range(200):
+            for _ in range(20):
+                deadline = now + rng.choice([rng.randrange(10), rng.randrange(600), rng.randrange(5000)])
+                a = wheel.schedule(deadline, deadline)
+                b = reference.schedule(deadline, deadline)
+                if rng.random() < 0.5:
+                    wheel.cancel(a)
+                    reference.cancel(b)
+            now += rng.randrange(50)
+            self.assertEqual(sorted(wheel.advance(now)), sorted(reference.advance(now)))
+        self.assertEqual(sorted(wheel.advance(10 ** 6)), sorted(reference.advance(10 ** 6)))
+
+    def test_benchmark_runs(self):
+        wheel, heap = benchmark(200, horizon=1000)
+        self.assertGreater(wheel, 0)
+        self.assertGreater(heap, 0)
+
+
+if __name__ == "__main__":
+    import sys
+
+    if '--bench' in sys.argv:
+        run_benchmark()
+    else:
+        unittest.main()